@@ -1,6 +1,12 @@
+import atexit
+
 from django.apps import AppConfig
 
 
 class AiIntegrationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_integration'
+
+    def ready(self):
+        from .services import close_session
+        atexit.register(close_session) # Release pooled AI model connections on shutdown
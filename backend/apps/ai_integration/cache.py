@@ -0,0 +1,36 @@
+import hashlib
+import orjson
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _get_cache():
+    """
+    Returns the Django cache used to store AI model responses.
+    """
+    return caches[getattr(settings, 'AI_CACHE_ALIAS', 'default')]
+
+def make_key(model_name, messages, **params):
+    """
+    Builds an exact-match cache key from the model name, the normalized prompt and the request parameters.
+    Whitespace differences in the prompt do not change the key.
+    """
+    normalized_messages = [
+        {'role': message['role'], 'content': ' '.join(message['content'].split())}
+        for message in messages
+    ]
+    raw_key = orjson.dumps({'model': model_name, 'messages': normalized_messages, **params}, option=orjson.OPT_SORT_KEYS)
+    return 'ai_response:' + hashlib.sha256(raw_key).hexdigest()
+
+def get_response(key):
+    """
+    Returns the cached AI model response for a key, or None on a cache miss.
+    """
+    return _get_cache().get(key)
+
+def set_response(key, response):
+    """
+    Stores an AI model response for a key.
+    """
+    timeout = getattr(settings, 'AI_CACHE_TIMEOUT', 60 * 60 * 24)
+    _get_cache().set(key, response, timeout)
@@ -0,0 +1,11 @@
+
+from rest_framework import serializers
+
+class TaskMetadataSerializer(serializers.Serializer):
+    """
+    Validates the JSON object returned by the AI for the combined task metadata prompt.
+    """
+    priority = serializers.FloatField()
+    deadline = serializers.DateField()
+    tags = serializers.ListField(child=serializers.CharField(allow_blank=True), allow_empty=True)
+    enhanced_description = serializers.CharField(allow_blank=True)
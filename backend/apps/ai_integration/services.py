@@ -1,10 +1,104 @@
 
+import logging
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings # To access Django settings (e.g., AI_MODEL_API_URL)
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 import re
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from . import cache as ai_cache
+from .serializers import TaskMetadataSerializer
+
+# Patterns used to clean up AI responses, compiled once at import
+_NUM_RE = re.compile(r'\d+\.?\d*') # Integers or floats
+_COMPLETE_NUM_RE = re.compile(r'\d+(?:\.\d+)?[^\d.]') # A number followed by something else, so it can't grow further
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}') # YYYY-MM-DD
+_TAGS_CLEANUP_TABLE = str.maketrans({'\n': ',', '.': None}) # Newlines separate tags, periods are dropped
+_SEVEN_DAYS = timedelta(days=7) # Fallback deadline when the AI can't suggest one
+_MIDNIGHT = time(0, 0)
+
+logger = logging.getLogger(__name__)
+
+# AI model settings, resolved once at import instead of for every AIService instance
+_API_URL = getattr(settings, 'AI_MODEL_API_URL', 'http://localhost:1234/v1/chat/completions')
+_MODEL_NAME = getattr(settings, 'AI_MODEL_NAME', 'local-model') # Default model name for LM Studio
+# (connect, read) timeouts in seconds, so a hung model server can't block a worker indefinitely
+_TIMEOUT = (getattr(settings, 'AI_CONNECT_TIMEOUT', 3.05), getattr(settings, 'AI_READ_TIMEOUT', 30))
+
+# Basic headers for the API request (read-only, as they are shared)
+_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+})
+
+
+def _build_session():
+    """
+    Builds the HTTP session used to talk to the AI model API.
+    Keep-alive connections are pooled so consecutive AI calls reuse the same socket.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        # Retry failed connections and gateway errors, but never a read timeout: the model was already generating
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=0,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['POST']),
+        ),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(_HEADERS)
+    return session
+
+# Shared by all AIService instances so they draw from a single connection pool
+_SESSION = _build_session()
+
+
+def _is_overload_error(error):
+    """
+    Returns whether a request error means the AI model server is overloaded or failing (429 or 5xx),
+    in which case the same error tends to repeat for every request.
+    """
+    if isinstance(error, requests.exceptions.RetryError): # Retries on 502/503/504 were exhausted
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
+
+
+def close_session():
+    """
+    Closes the shared HTTP session and releases its pooled connections.
+    """
+    _SESSION.close()
+
+
+def _find_date(content):
+    """
+    Returns the first YYYY-MM-DD date in the text if it is a valid date, otherwise None.
+    """
+    date_match = _DATE_RE.search(content)
+    if date_match:
+        try:
+            return date.fromisoformat(date_match.group(0))
+        except ValueError:
+            pass
+    return None
+
+def _start_of_day(day):
+    """
+    Returns the aware datetime at midnight of the given date in the current time zone.
+    """
+    return timezone.make_aware(datetime.combine(day, _MIDNIGHT))
+
 
 class AIService:
     """
@@ -15,18 +109,22 @@ class AIService:
         """
         Initializes the AI Service with the API URL and model name.
         """
-        self.api_url = api_url or getattr(settings, 'AI_MODEL_API_URL', 'http://localhost:1234/v1/chat/completions' )
-        self.model_name = model_name or getattr(settings, 'AI_MODEL_NAME', 'local-model') # Default model name for LM Studio
-
-        # Basic headers for the API request
-        self.headers = {
-            "Content-Type": "application/json",
-        }
+        self.api_url = api_url or _API_URL
+        self.model_name = model_name or _MODEL_NAME
+        self.headers = _HEADERS
+        self.session = _SESSION
 
-    def _make_request(self, messages, max_tokens=150, temperature=0.7):
+    def _make_request(self, messages, max_tokens=150, temperature=0.7, response_format=None, is_valid=None):
         """
         Internal method to send a request to the AI model API.
+        Responses are cached, so repeating an identical prompt does not call the model again.
+        Only responses with content accepted by `is_valid` (if given) are cached, so an unusable answer is asked again.
         """
+        cache_key = ai_cache.make_key(self.model_name, messages, max_tokens=max_tokens, temperature=temperature, response_format=response_format)
+        cached_response = ai_cache.get_response(cache_key)
+        if cached_response is not None:
+            return cached_response
+
         payload = {
             "model": self.model_name,
             "messages": messages,
@@ -34,14 +132,68 @@ class AIService:
             "temperature": temperature,
             # "stream": False # Set to True if you want streaming responses
         }
+        if response_format:
+            payload["response_format"] = response_format
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
+            response = self.session.post(self.api_url, data=orjson.dumps(payload), timeout=_TIMEOUT)
             response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error communicating with AI model: {e}")
+            result = orjson.loads(response.content)
+            content = self._extract_content(result)
+            if content and (is_valid is None or is_valid(content)): # Failed requests are never cached
+                ai_cache.set_response(cache_key, result)
+            return result
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            # Logged at most once a minute while the server is overloaded, to avoid flooding the logs
+            logger.warning("Error communicating with AI model: %s", e, extra={'rate_limit': _is_overload_error(e)})
+            return None
+
+    def _stream_until(self, messages, pattern, max_tokens=150, temperature=0.7, is_valid=None):
+        """
+        Internal method to stream a response from the AI model API.
+        Stops reading as soon as the text received so far matches the compiled `pattern`, so short answers
+        don't wait for the model to use up the whole token budget.
+        Returns the received text, or None if the request failed.
+        Only text accepted by `is_valid` (if given) is cached, so an unusable answer is asked again.
+        """
+        cache_key = ai_cache.make_key(self.model_name, messages, max_tokens=max_tokens, temperature=temperature, stream_until=pattern.pattern)
+        cached_content = ai_cache.get_response(cache_key)
+        if cached_content is not None:
+            return cached_content
+
+        payload = {
+            "model": self.model_name,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+        content = ""
+        try:
+            # Leaving the block closes the response, which ends generation early on the server
+            with self.session.post(self.api_url, data=orjson.dumps(payload), timeout=_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    # Server-sent events: each chunk arrives as a 'data: {...}' line
+                    if not line.startswith(b'data:'):
+                        continue
+                    data = line[len(b'data:'):].strip()
+                    if data == b'[DONE]':
+                        break
+                    choices = orjson.loads(data).get('choices')
+                    if choices:
+                        content += choices[0].get('delta', {}).get('content') or ''
+                        if pattern.search(content):
+                            break
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            # Logged at most once a minute while the server is overloaded, to avoid flooding the logs
+            logger.warning("Error communicating with AI model: %s", e, extra={'rate_limit': _is_overload_error(e)})
             return None
 
+        content = content.strip()
+        if content and (is_valid is None or is_valid(content)):
+            ai_cache.set_response(cache_key, content)
+        return content
+
     def _extract_content(self, response):
         """
         Extracts the content from the AI model's response.
@@ -58,17 +210,38 @@ class AIService:
             {"role": "system", "content": "You are a helpful assistant that analyzes text and extracts key information."},
             {"role": "user", "content": f"Analyze the following text and extract key entities, keywords, and a general sentiment (positive, negative, neutral). Format the output as a JSON object with keys 'entities', 'keywords', 'sentiment'. Text: '{context_text}'"}
         ]
-        response = self._make_request(messages, max_tokens=300, temperature=0.5)
+        response = self._make_request(
+            messages, max_tokens=300, temperature=0.5, is_valid=lambda content: self._parse_insights(content) is not None
+        )
         if response:
             content = self._extract_content(response)
-            try:
-                # Attempt to parse the content as JSON
-                return json.loads(content)
-            except json.JSONDecodeError:
-                print(f"AI response was not valid JSON: {content}")
-                return {"error": "AI response format error", "raw_response": content}
+            insights = self._parse_insights(content)
+            if insights is not None:
+                return insights
+            logger.warning("AI response was not a valid JSON object: %s", content)
+            return {"error": "AI response format error", "raw_response": content}
         return None
 
+    def _parse_insights(self, content):
+        """
+        Parses the JSON object returned for the context analysis prompt.
+        Returns None if the content isn't a JSON object (e.g. a bare number, string or list).
+        """
+        try:
+            insights = orjson.loads(content)
+        except orjson.JSONDecodeError: # Subclass of json.JSONDecodeError
+            return None
+        return insights if isinstance(insights, dict) else None
+
+    def analyze_contexts(self, context_texts):
+        """
+        Analyzes several context texts, returning their insights in the same order.
+        The AI requests are sent concurrently so the model server can batch them together.
+        """
+        max_workers = getattr(settings, 'AI_MAX_PARALLEL_REQUESTS', 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.analyze_context, context_texts))
+
     def get_task_priority_score(self, task_title, task_description, context_insights=None):
         """
         Generates an AI-powered priority score for a task based on its details and context.
@@ -76,57 +249,105 @@ class AIService:
         """
         context_info = ""
         if context_insights:
-            context_info = f"Relevant context insights: {json.dumps(context_insights)}. "
+            context_info = f"Relevant context insights: {orjson.dumps(context_insights).decode()}. "
 
         messages = [
             {"role": "system", "content": "You are an AI assistant that helps prioritize tasks. Assign a priority score from 0 to 100, where 100 is most urgent. ONLY output the score as a number, nothing else. For example: 75"},
             {"role": "user", "content": f"Task: '{task_title}'. Description: '{task_description}'. {context_info}What is the priority score (0-100)? ONLY the number:"}
         ]
-        response = self._make_request(messages, max_tokens=10, temperature=0.2) # Low temperature for consistent scores
-        if response:
-            content = self._extract_content(response)
+        # Low temperature for consistent scores; stop once a complete number has been received
+        content = self._stream_until(messages, _COMPLETE_NUM_RE, max_tokens=10, temperature=0.2, is_valid=_NUM_RE.search)
+        if content:
             # Clean the content: extract only numbers
-            numbers = re.findall(r'\d+\.?\d*', content) # Find all numbers (integers or floats)
+            numbers = _NUM_RE.findall(content) # Find all numbers (integers or floats)
             if numbers:
                 try:
                     score = float(numbers[0]) # Take the first number found
                     return max(0, min(100, score))
                 except ValueError:
-                    print(f"AI response for priority could not be converted to number after cleaning: {content}")
+                    logger.warning("AI response for priority could not be converted to number after cleaning: %s", content)
             else:
-                print(f"AI response for priority contained no numbers: {content}")
+                logger.warning("AI response for priority contained no numbers: %s", content)
         return 0.0
 
+    def score_batch(self, tasks):
+        """
+        Generates AI-powered priority scores for several tasks with a single request.
+        Expects a list of (title, description) pairs and returns their scores in the same order.
+        If the AI doesn't return one score per task, each task is scored individually instead.
+        """
+        if not tasks:
+            return []
+        task_lines = "\n".join(
+            f"{number}. Task: '{title}'. Description: '{description}'."
+            for number, (title, description) in enumerate(tasks, start=1)
+        )
+        messages = [
+            {"role": "system", "content": "You are an AI assistant that helps prioritize tasks. Assign each task a priority score from 0 to 100, where 100 is most urgent. ONLY output a JSON array with one score per task, in the order given, nothing else. For example, for 3 tasks: [75, 20, 90]"},
+            {"role": "user", "content": f"{task_lines}\nWhat are the priority scores (0-100) of these {len(tasks)} tasks? ONLY the JSON array:"}
+        ]
+        # Low temperature for consistent scores; a few tokens per score
+        response = self._make_request(
+            messages, max_tokens=6 * len(tasks) + 10, temperature=0.2,
+            is_valid=lambda content: self._parse_scores(content, len(tasks)) is not None,
+        )
+        content = self._extract_content(response)
+        scores = self._parse_scores(content, len(tasks))
+        if scores is not None:
+            return scores
+
+        logger.warning("AI response for batch priority was not a JSON array of %d scores: %s", len(tasks), content)
+        max_workers = getattr(settings, 'AI_MAX_PARALLEL_REQUESTS', 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda task: self.get_task_priority_score(*task), tasks))
+
+    def _parse_scores(self, content, count):
+        """
+        Parses the JSON array of priority scores returned for the batch priority prompt.
+        """
+        if not content:
+            return None
+        # Ignore any text the model adds around the JSON array
+        start, end = content.find('['), content.rfind(']')
+        try:
+            scores = orjson.loads(content[start:end + 1])
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(scores, list) or len(scores) != count:
+            return None
+        if not all(isinstance(score, (int, float)) and not isinstance(score, bool) for score in scores):
+            return None
+        return [max(0.0, min(100.0, float(score))) for score in scores]
+
     def suggest_deadline(self, task_title, task_description, current_date, context_insights=None):
         """
         Suggests a realistic deadline for a task.
+        Returns an aware datetime at the start of the suggested day, as stored in Task.deadline.
         """
         context_info = ""
         if context_insights:
-            context_info = f"Relevant context insights: {json.dumps(context_insights)}. "
+            context_info = f"Relevant context insights: {orjson.dumps(context_insights).decode()}. "
 
         messages = [
             {"role": "system", "content": "You are an AI assistant that suggests realistic deadlines. Output the suggested deadline in 'YYYY-MM-DD' format. ONLY output the date, nothing else. Example: User: 'Task: Buy groceries'. Current date: 2025-07-06. AI: 2025-07-07"},
             {"role": "user", "content": f"Task: '{task_title}'. Description: '{task_description}'. Current date: {current_date.strftime('%Y-%m-%d')}. ONLY the date (YYYY-MM-DD):"}
         ]
-        response = self._make_request(messages, max_tokens=20, temperature=0.7)
-        if response:
-            content = self._extract_content(response)
+        # Stop once a full YYYY-MM-DD date has been received
+        content = self._stream_until(messages, _DATE_RE, max_tokens=20, temperature=0.7, is_valid=_find_date)
+        if content:
             # Try to extract a date-like string first
             # This regex looks for YYYY-MM-DD pattern
-            date_match = re.search(r'\d{4}-\d{2}-\d{2}', content)
+            date_match = _DATE_RE.search(content)
             if date_match:
                 date_string = date_match.group(0)
                 try:
-                    # Convert date object to datetime object at the start of the day
-                    return timezone.make_aware(timezone.datetime.strptime(date_string, '%Y-%m-%d')) # <--- CHANGE HERE
+                    return _start_of_day(date.fromisoformat(date_string))
                 except ValueError:
-                    print(f"AI response for deadline was not a valid date after cleaning: {content}")
+                    logger.warning("AI response for deadline was not a valid date after cleaning: %s", content)
             else:
-                print(f"AI response for deadline did not contain a YYYY-MM-DD pattern: {content}")
+                logger.warning("AI response for deadline did not contain a YYYY-MM-DD pattern: %s", content)
         # Fallback: suggest 7 days from now if AI fails
-        # Convert date object to datetime object at the start of the day
-        return timezone.make_aware(timezone.datetime.combine(current_date + timedelta(days=7), timezone.datetime.min.time())) # <--- CHANGE HERE
+        return _start_of_day(current_date + _SEVEN_DAYS)
         
     def suggest_categories_and_tags(self, task_title, task_description, existing_categories=None):
         """
@@ -140,22 +361,27 @@ class AIService:
             {"role": "system", "content": "You are an AI assistant that suggests categories and tags for tasks. Output a comma-separated list of categories/tags. ONLY output the comma-separated list, nothing else. For example: 'Marketing, Social Media, Campaign'"},
         {"role": "user", "content": f"Task: '{task_title}'. Description: '{task_description}'. {existing_cats_info}Suggest categories and tags for this task (comma-separated, ONLY the list):"}
         ]
-        response = self._make_request(messages, max_tokens=50, temperature=0.7)
+        response = self._make_request(messages, max_tokens=50, temperature=0.7, is_valid=self._parse_tags)
         if response:
-            content = self._extract_content(response)
-            # Clean the content: remove numbers, newlines, and split by comma
-            cleaned_content = content.replace('\n', ',').replace('.', '').strip() # Remove newlines and periods
-            # Split by comma, strip whitespace, and filter out empty strings
-            return [tag.strip() for tag in cleaned_content.split(',') if tag.strip()]
+            return self._parse_tags(self._extract_content(response))
         return []
 
+    def _parse_tags(self, content):
+        """
+        Parses the comma-separated list of categories/tags returned for the category prompt.
+        """
+        # Clean the content: remove numbers, newlines, and split by comma
+        cleaned_content = content.translate(_TAGS_CLEANUP_TABLE).strip() # Remove newlines and periods
+        # Split by comma, strip whitespace, and filter out empty strings
+        return [tag.strip() for tag in cleaned_content.split(',') if tag.strip()]
+
     def enhance_task_description(self, task_title, task_description, context_insights=None):
         """
         Enhances a task description with more details based on context.
         """
         context_info = ""
         if context_insights:
-            context_info = f"Relevant context insights: {json.dumps(context_insights)}. "
+            context_info = f"Relevant context insights: {orjson.dumps(context_insights).decode()}. "
 
         messages = [
             {"role": "system", "content": "You are an AI assistant that enhances task descriptions. Expand on the provided task description, making it more detailed and actionable, especially considering any provided context. Keep it concise but informative."},
@@ -166,3 +392,81 @@ class AIService:
             return self._extract_content(response)
         return task_description # Return original if AI fails
 
+    def generate_task_metadata(self, task_title, task_description, current_date, context_insights=None, existing_categories=None):
+        """
+        Generates the priority score, deadline, categories and enhanced description of a task with a single AI request.
+        Returns None if the AI doesn't produce a valid JSON object, even when asked for JSON output explicitly.
+        """
+        context_info = ""
+        if context_insights:
+            context_info = f"Relevant context insights: {orjson.dumps(context_insights).decode()}. "
+        existing_cats_info = ""
+        if existing_categories:
+            existing_cats_info = f"Existing categories: {', '.join(existing_categories)}. "
+
+        messages = [
+            {"role": "system", "content": "You are an AI assistant that plans tasks. Respond with strict JSON: a single JSON object with exactly these keys: 'priority' (a number from 0 to 100, where 100 is most urgent), 'deadline' (a realistic deadline in 'YYYY-MM-DD' format), 'tags' (a list of category/tag strings), 'enhanced_description' (the task description expanded to be more detailed and actionable, concise but informative). ONLY output the JSON object, nothing else."},
+            {"role": "user", "content": f"Task: '{task_title}'. Description: '{task_description}'. Current date: {current_date.strftime('%Y-%m-%d')}. {context_info}{existing_cats_info}JSON object:"}
+        ]
+        # Retry once in JSON mode if the first answer can't be parsed
+        for response_format in (None, {"type": "json_object"}):
+            response = self._make_request(
+                messages, max_tokens=260, temperature=0.3, response_format=response_format,
+                is_valid=lambda content: self._parse_task_metadata(content) is not None,
+            )
+            content = self._extract_content(response)
+            metadata = self._parse_task_metadata(content)
+            if metadata is not None:
+                return {
+                    'priority_score': max(0, min(100, metadata['priority'])),
+                    'deadline': _start_of_day(metadata['deadline']),
+                    'categories': [tag.strip() for tag in metadata['tags'] if tag.strip()],
+                    'enhanced_description': metadata['enhanced_description'] or task_description,
+                }
+        logger.warning("AI response for task metadata was not a valid JSON object: %s", content)
+        return None
+
+    def _parse_task_metadata(self, content):
+        """
+        Parses and validates the JSON object returned for the task metadata prompt.
+        """
+        if not content:
+            return None
+        # Ignore any text the model adds around the JSON object
+        start, end = content.find('{'), content.rfind('}')
+        try:
+            data = orjson.loads(content[start:end + 1])
+        except orjson.JSONDecodeError:
+            return None
+        serializer = TaskMetadataSerializer(data=data)
+        if serializer.is_valid():
+            return serializer.validated_data
+        return None
+
+    def enrich_task(self, task_title, task_description, current_date, existing_categories=None, context_text=None):
+        """
+        Generates all AI suggestions for a task (priority score, deadline, categories, enhanced description).
+        The optional context text is analyzed first, then all suggestions are generated with a single request.
+        If that fails, the individual prompts are used instead; they only depend on the context insights,
+        so they are submitted together and run concurrently.
+        """
+        context_insights = self.analyze_context(context_text) if context_text else None
+
+        suggestions = self.generate_task_metadata(task_title, task_description, current_date, context_insights, existing_categories)
+        if suggestions is None:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    'priority_score': executor.submit(self.get_task_priority_score, task_title, task_description, context_insights),
+                    'deadline': executor.submit(self.suggest_deadline, task_title, task_description, current_date, context_insights),
+                    'categories': executor.submit(self.suggest_categories_and_tags, task_title, task_description, existing_categories),
+                    'enhanced_description': executor.submit(self.enhance_task_description, task_title, task_description, context_insights),
+                }
+                # Collect results only after every call has been submitted
+                suggestions = {key: future.result() for key, future in futures.items()}
+
+        suggestions['context_insights'] = context_insights
+        return suggestions
+
+
+# Shared instance for request handlers and background tasks; AIService keeps no per-call state
+ai_service = AIService()
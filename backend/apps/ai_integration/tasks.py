@@ -0,0 +1,87 @@
+from celery import shared_task
+from django.utils import timezone
+from context.models import ContextEntry
+from .services import ai_service
+
+
+# Fields written back once the content of an entry has been analyzed
+_ANALYSIS_FIELDS = (
+    'processed_insights', 'processed_insights_hash', 'processed_insights_status', 'analyzed_content_hash', 'updated_at'
+)
+# Fields written back when the AI returned the insights the entry already has
+_UNCHANGED_ANALYSIS_FIELDS = ('processed_insights_status', 'analyzed_content_hash')
+_LOADED_FIELDS = ('id', 'content', 'processed_insights_hash', 'processed_insights_status', 'analyzed_content_hash')
+
+
+@shared_task
+def analyze_context_entry(entry_id):
+    """
+    Analyzes the content of a context entry with AI and stores the resulting insights.
+    Runs in a Celery worker so the API can respond without waiting for the AI model.
+    """
+    try:
+        entry = ContextEntry.objects.only(*_LOADED_FIELDS).get(pk=entry_id)
+    except ContextEntry.DoesNotExist:
+        return # Entry was deleted before the task ran
+
+    try:
+        fields = _apply_insights(entry, ai_service.analyze_context(entry.content))
+    except Exception:
+        # Never leave the entry pending, which clients poll for
+        ContextEntry.objects.filter(pk=entry.pk).update(processed_insights_status='error')
+        raise
+    if fields:
+        # A single UPDATE query rather than saving the model, which would rewrite every column
+        ContextEntry.objects.filter(pk=entry.pk).update(**{field: getattr(entry, field) for field in fields})
+
+
+@shared_task
+def analyze_context_entries(entry_ids):
+    """
+    Analyzes the content of several context entries and stores the resulting insights.
+    The AI requests are sent concurrently so the model server can batch them together,
+    and the results are written back with bulk UPDATE queries.
+    """
+    entries = list(ContextEntry.objects.filter(pk__in=entry_ids).only(*_LOADED_FIELDS))
+    entries_by_fields = {_ANALYSIS_FIELDS: [], _UNCHANGED_ANALYSIS_FIELDS: []}
+    try:
+        insights_list = ai_service.analyze_contexts([entry.content for entry in entries])
+        for entry, insights in zip(entries, insights_list):
+            fields = _apply_insights(entry, insights)
+            if fields:
+                entries_by_fields[fields].append(entry)
+    except Exception:
+        # Never leave the entries pending, which clients poll for
+        ContextEntry.objects.filter(pk__in=entry_ids, processed_insights_status='pending').update(processed_insights_status='error')
+        raise
+    for fields, changed_entries in entries_by_fields.items():
+        ContextEntry.objects.bulk_update(changed_entries, fields) # No query when the list is empty
+
+
+def _apply_insights(entry, insights):
+    """
+    Sets the AI insights of a context entry along with the resulting analysis status.
+    Returns the fields that need to be written back, or None if nothing changed.
+    Insights identical to the stored ones (e.g. from a retried analysis) aren't written again.
+    Entries the AI failed to analyze, or analyzed into something other than a JSON object, keep their previous insights.
+    """
+    previous_state = (entry.processed_insights_status, entry.analyzed_content_hash)
+    if insights and isinstance(insights, dict):
+        if 'error' in insights:
+            entry.processed_insights_status = 'error'
+        else:
+            entry.processed_insights_status = 'done'
+            entry.analyzed_content_hash = ContextEntry.hash_content(entry.content) # Lets identical content reuse these insights
+
+        insights_hash = ContextEntry.hash_insights(insights)
+        if entry.processed_insights_hash is None or bytes(entry.processed_insights_hash) != insights_hash:
+            entry.processed_insights = insights
+            entry.processed_insights_hash = insights_hash
+            entry.updated_at = timezone.now()
+            return _ANALYSIS_FIELDS
+    else:
+        entry.processed_insights_status = 'error'
+
+    if (entry.processed_insights_status, entry.analyzed_content_hash) != previous_state:
+        return _UNCHANGED_ANALYSIS_FIELDS
+    return None
@@ -1,3 +1,240 @@
-from django.test import TestCase
+import re
+from datetime import date
+from unittest import mock
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from context.models import ContextEntry
+from .services import AIService
+from .tasks import analyze_context_entries, analyze_context_entry
 
-# Create your tests here.
+
+class FakeStreamResponse:
+    """
+    Stands in for a streamed requests response, yielding the given server-sent event lines.
+    """
+    def __init__(self, lines):
+        self.lines = lines
+        self.lines_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        for line in self.lines:
+            self.lines_read += 1
+            yield line
+
+
+def sse_chunk(text):
+    """
+    Returns a server-sent event line carrying one chunk of streamed content.
+    """
+    return b'data: {"choices": [{"delta": {"content": "' + text.encode() + b'"}}]}'
+
+
+class StreamUntilTests(SimpleTestCase):
+    """
+    Streamed AI answers are read until the expected value is complete.
+    """
+    def setUp(self):
+        cache.clear()
+        self.service = AIService()
+        self.service.session = mock.Mock()
+
+    def stream(self, lines, pattern=re.compile(r'\d+(?:\.\d+)?[^\d.]')):
+        response = FakeStreamResponse(lines)
+        self.service.session.post.return_value = response
+        content = self.service._stream_until([{'role': 'user', 'content': 'Score?'}], pattern)
+        return content, response
+
+    def test_stops_once_pattern_matches(self):
+        content, response = self.stream([sse_chunk('7'), sse_chunk('5 '), sse_chunk('because'), b'data: [DONE]'])
+        self.assertEqual(content, '75')
+        self.assertEqual(response.lines_read, 2)
+
+    def test_reads_until_done(self):
+        content, _ = self.stream([b': keep-alive', sse_chunk('8'), b'', sse_chunk('0'), b'data: [DONE]', sse_chunk('1')])
+        self.assertEqual(content, '80')
+
+    def test_ignores_chunks_without_content(self):
+        content, _ = self.stream([b'data: {"choices": [{"delta": {"role": "assistant"}}]}', sse_chunk('42'), b'data: [DONE]'])
+        self.assertEqual(content, '42')
+
+    def test_request_error_returns_none(self):
+        self.service.session.post.side_effect = requests.exceptions.ConnectionError('refused')
+        with self.assertLogs('ai_integration.services', 'WARNING'):
+            content = self.service._stream_until([{'role': 'user', 'content': 'Score?'}], re.compile('x'))
+        self.assertIsNone(content)
+
+    def test_caches_only_valid_answers(self):
+        self.stream([sse_chunk('75 '), b'data: [DONE]'])
+        self.stream([b'data: [DONE]']) # Empty answer to another prompt
+        self.service.session.post.reset_mock()
+        content = self.service._stream_until([{'role': 'user', 'content': 'Score?'}], re.compile(r'\d+(?:\.\d+)?[^\d.]'))
+        self.assertEqual(content, '75')
+        self.service.session.post.assert_not_called()
+
+    def test_doesnt_cache_empty_or_rejected_answers(self):
+        for lines, is_valid in (([b'data: [DONE]'], None), ([sse_chunk('soon'), b'data: [DONE]'], lambda content: False)):
+            with self.subTest(lines=lines):
+                response = FakeStreamResponse(lines)
+                self.service.session.post.return_value = response
+                messages = [{'role': 'user', 'content': 'Deadline?'}]
+                self.service._stream_until(messages, re.compile('x'), is_valid=is_valid)
+                self.service._stream_until(messages, re.compile('x'), is_valid=is_valid)
+                self.assertEqual(response.lines_read, 2 * len(lines)) # Asked again
+
+    def test_invalid_json_chunk_returns_none(self):
+        with self.assertLogs('ai_integration.services', 'WARNING'):
+            content, _ = self.stream([b'data: {not json'])
+        self.assertIsNone(content)
+
+
+class MakeRequestCacheTests(SimpleTestCase):
+    """
+    Complete AI responses are only cached once their content has been validated.
+    """
+    def setUp(self):
+        cache.clear()
+        self.service = AIService()
+        self.service.session = mock.Mock()
+
+    def reply(self, content):
+        response = mock.Mock(content=b'{"choices": [{"message": {"content": "' + content.encode() + b'"}}]}')
+        self.service.session.post.return_value = response
+
+    def test_invalid_batch_scores_are_asked_again(self):
+        self.reply('[10, 20]') # Two scores for three tasks
+        with mock.patch.object(self.service, 'get_task_priority_score', return_value=50.0), \
+                self.assertLogs('ai_integration.services', 'WARNING'):
+            self.service.score_batch([('A', ''), ('B', ''), ('C', '')])
+            self.service.score_batch([('A', ''), ('B', ''), ('C', '')])
+        self.assertEqual(self.service.session.post.call_count, 2)
+
+    def test_valid_batch_scores_are_cached(self):
+        self.reply('[10, 20, 30]')
+        self.service.score_batch([('A', ''), ('B', ''), ('C', '')])
+        self.assertEqual(self.service.score_batch([('A', ''), ('B', ''), ('C', '')]), [10.0, 20.0, 30.0])
+        self.assertEqual(self.service.session.post.call_count, 1)
+
+    def test_malformed_context_analysis_is_asked_again(self):
+        self.reply('not json')
+        with self.assertLogs('ai_integration.services', 'WARNING'):
+            self.service.analyze_context('Meeting at 10')
+            self.service.analyze_context('Meeting at 10')
+        self.assertEqual(self.service.session.post.call_count, 2)
+
+
+class ParseScoresTests(SimpleTestCase):
+    """
+    Batch priority answers are only used when they hold one valid score per task.
+    """
+    def setUp(self):
+        self.service = AIService()
+
+    def test_parses_array_surrounded_by_text(self):
+        self.assertEqual(self.service._parse_scores('Scores: [10, 55.5, 90]. Done', 3), [10.0, 55.5, 90.0])
+
+    def test_clamps_scores(self):
+        self.assertEqual(self.service._parse_scores('[-5, 150]', 2), [0.0, 100.0])
+
+    def test_rejects_wrong_length(self):
+        self.assertIsNone(self.service._parse_scores('[10, 20]', 3))
+
+    def test_rejects_non_numbers(self):
+        self.assertIsNone(self.service._parse_scores('[10, "high"]', 2))
+        self.assertIsNone(self.service._parse_scores('[true, 20]', 2))
+
+    def test_rejects_invalid_json(self):
+        self.assertIsNone(self.service._parse_scores('no scores', 1))
+        self.assertIsNone(self.service._parse_scores('', 1))
+
+
+class ParseTaskMetadataTests(SimpleTestCase):
+    """
+    Fused task metadata answers are validated before they are used.
+    """
+    def setUp(self):
+        self.service = AIService()
+
+    def test_parses_object_surrounded_by_text(self):
+        content = 'Here: {"priority": 70, "deadline": "2026-10-20", "tags": ["Work"], "enhanced_description": "Details"} Thanks'
+        metadata = self.service._parse_task_metadata(content)
+        self.assertEqual(metadata['priority'], 70.0)
+        self.assertEqual(metadata['deadline'], date(2026, 10, 20))
+        self.assertEqual(metadata['tags'], ['Work'])
+
+    def test_rejects_missing_keys(self):
+        self.assertIsNone(self.service._parse_task_metadata('{"priority": 70}'))
+
+    def test_rejects_invalid_values(self):
+        content = '{"priority": "urgent", "deadline": "someday", "tags": [], "enhanced_description": ""}'
+        self.assertIsNone(self.service._parse_task_metadata(content))
+
+    def test_rejects_invalid_json(self):
+        self.assertIsNone(self.service._parse_task_metadata('{priority: 70'))
+        self.assertIsNone(self.service._parse_task_metadata(None))
+
+
+class AnalyzeContextTests(SimpleTestCase):
+    """
+    Context analysis only returns insights for JSON object answers.
+    """
+    def setUp(self):
+        cache.clear()
+        self.service = AIService()
+
+    def analyze(self, content):
+        with mock.patch.object(self.service, '_make_request', return_value={'choices': [{'message': {'content': content}}]}):
+            return self.service.analyze_context('Meeting at 10')
+
+    def test_returns_json_object(self):
+        self.assertEqual(self.analyze('{"sentiment": "neutral"}'), {'sentiment': 'neutral'})
+
+    def test_non_object_answers_are_format_errors(self):
+        for content in ('42', 'true', '["meeting"]', 'not json'):
+            with self.subTest(content=content), self.assertLogs('ai_integration.services', 'WARNING'):
+                self.assertEqual(self.analyze(content)['error'], 'AI response format error')
+
+
+@mock.patch('ai_integration.tasks.ai_service')
+class AnalyzeContextJobTests(TestCase):
+    """
+    Analysis jobs always settle the status of the entries they analyze.
+    """
+    def setUp(self):
+        self.entry = ContextEntry.objects.create(content='Meeting at 10', processed_insights_status='pending')
+
+    def assertStatus(self, status):
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.processed_insights_status, status)
+
+    def test_stores_insights(self, ai_service):
+        ai_service.analyze_context.return_value = {'sentiment': 'neutral'}
+        analyze_context_entry(self.entry.pk)
+        self.assertStatus('done')
+        self.assertEqual(self.entry.processed_insights, {'sentiment': 'neutral'})
+
+    def test_non_object_insights_are_errors(self, ai_service):
+        ai_service.analyze_context.return_value = 42
+        analyze_context_entry(self.entry.pk)
+        self.assertStatus('error')
+
+    def test_failed_analysis_is_an_error(self, ai_service):
+        ai_service.analyze_context.side_effect = RuntimeError('model crashed')
+        with self.assertRaises(RuntimeError):
+            analyze_context_entry(self.entry.pk)
+        self.assertStatus('error')
+
+    def test_failed_bulk_analysis_is_an_error(self, ai_service):
+        ai_service.analyze_contexts.side_effect = RuntimeError('model crashed')
+        with self.assertRaises(RuntimeError):
+            analyze_context_entries([self.entry.pk])
+        self.assertStatus('error')
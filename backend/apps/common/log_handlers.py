@@ -0,0 +1,78 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+# Tells the background writer thread to stop
+_STOP = object()
+
+
+class BackgroundStreamHandler(logging.StreamHandler):
+    """
+    Logging handler that writes records to stderr from a background thread.
+    Logging calls only format the record and put it on a queue, so request threads never block on console I/O.
+    The writer thread is started on the first record logged by each process, so forked processes
+    (e.g. Celery prefork workers) get their own thread instead of queuing records nobody writes.
+    """
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def emit(self, record):
+        # Called with the handler's lock held; logging re-creates the lock in forked children
+        try:
+            if self._pid != os.getpid():
+                self._start_writer()
+            self._queue.put((record, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        # Write the queued records before the handler is closed (logging closes handlers at exit)
+        if self._pid == os.getpid():
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._pid = None
+        super().close()
+
+    def _start_writer(self):
+        self._queue = queue.SimpleQueue() # Records queued by the parent process stay with the parent
+        self._thread = threading.Thread(target=self._write_queued, args=(self._queue,), name='BackgroundStreamHandler', daemon=True)
+        self._thread.start()
+        self._pid = os.getpid()
+
+    def _write_queued(self, records):
+        while (item := records.get()) is not _STOP:
+            record, message = item
+            try:
+                # Not self.flush(), which takes the handler's lock: logging holds it while closing the handler
+                self.stream.write(message + self.terminator)
+                self.stream.flush()
+            except Exception:
+                self.handleError(record)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets a rate-limited message through at most once per interval (in seconds).
+    Only records logged with extra={'rate_limit': True} are limited; all other records pass.
+    """
+    def __init__(self, interval=60):
+        super().__init__()
+        self.interval = interval
+        self._last_emitted = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, 'rate_limit', False):
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_emitted.get(key, float('-inf')) < self.interval:
+                return False
+            self._last_emitted[key] = now
+        return True
@@ -0,0 +1,59 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalGETMixin:
+    """
+    Adds ETag and Last-Modified headers to the list and retrieve actions of a ViewSet,
+    answering 304 Not Modified without serializing anything when the client's copy is still current.
+    Lists are versioned by the latest modification time of the `last_modified_fields` and their row count,
+    single objects by the latest modification time of the same fields.
+    """
+    last_modified_fields = ('updated_at',)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        count, last_modified = self._summarize(queryset)
+        return self._conditional_response(
+            request, last_modified, count, lambda: super(ConditionalGETMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        # Aggregated like the list, so related rows rendered with the instance (e.g. its category name) count too
+        _, last_modified = self._summarize(type(instance)._default_manager.filter(pk=instance.pk))
+        return self._conditional_response(
+            request, last_modified, instance.pk, lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def _summarize(self, queryset):
+        """
+        Returns the row count of the queryset and the latest modification time of its `last_modified_fields`.
+        """
+        aggregates = {f'last_modified_{i}': Max(field) for i, field in enumerate(self.last_modified_fields)}
+        summary = queryset.aggregate(count=Count('pk'), **aggregates)
+        count = summary.pop('count')
+        last_modified = max((value for value in summary.values() if value is not None), default=None)
+        return count, last_modified
+
+    def _conditional_response(self, request, last_modified, version, get_response):
+        """
+        Returns 304 Not Modified if the client's ETag or modification time is current,
+        otherwise the response from `get_response` with the validators set.
+        """
+        # The URL (including filters and cursor) and the media type identify the representation
+        representation = f'{request.get_full_path()}|{request.accepted_media_type}|{last_modified and last_modified.isoformat()}|{version}'
+        etag = quote_etag(hashlib.blake2b(representation.encode('utf-8'), digest_size=16).hexdigest())
+        last_modified_timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified_timestamp)
+        if response is not None:
+            return response
+        response = get_response()
+        response['ETag'] = etag
+        if last_modified_timestamp is not None:
+            response['Last-Modified'] = http_date(last_modified_timestamp)
+        return response
@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TimestampCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the `timestamp` index, newest entries first.
+    Each page is a range scan from the cursor, so its cost doesn't grow with the page number.
+    """
+    ordering = '-timestamp'
+    page_size = 50
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Default keyset pagination over the `created_at` index, newest first.
+    Deep pages cost the same as the first one, unlike OFFSET-based pagination.
+    """
+    ordering = '-created_at'
@@ -0,0 +1,44 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Handles the types orjson doesn't serialize natively (e.g. Decimal, lazy translation strings)
+_fallback_encoder = JSONEncoder()
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    Renderer which serializes to JSON using orjson instead of the standard library encoder.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+
+        # Render UTC datetimes with a 'Z' suffix and non-string keys (e.g. list item indexes in validation errors)
+        # as strings, like DRF does
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2 # orjson only supports two-space indentation
+
+        ret = orjson.dumps(data, default=_fallback_encoder.default, option=option)
+        # Escape U+2028 and U+2029 like DRF does, for compatibility with JavaScript parsers
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class OrjsonParser(JSONParser):
+    """
+    Parses JSON-serialized data using orjson.
+    """
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parses the incoming bytestream as JSON and returns the resulting data.
+        """
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
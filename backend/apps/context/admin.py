@@ -1,5 +1,6 @@
 
 from django.contrib import admin
+from django.db.models.functions import Substr
 from .models import ContextEntry
 
 @admin.register(ContextEntry)
@@ -23,7 +24,15 @@ class ContextEntryAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """
+        Avoid loading the full content and insights for every row; the list only needs a short preview.
+        """
+        queryset = super().get_queryset(request)
+        # One character past the preview length tells whether the content was truncated
+        return queryset.defer('content', 'processed_insights').annotate(content_start=Substr('content', 1, 76))
+
     def content_preview(self, obj):
-        return obj.content[:75] + '...' if len(obj.content) > 75 else obj.content
+        return obj.content_start[:75] + '...' if len(obj.content_start) > 75 else obj.content_start
     content_preview.short_description = 'Content'
 
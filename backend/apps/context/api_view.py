@@ -1,19 +1,31 @@
-# context/views.py
+# context/api_view.py
 
+import logging
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from kombu.exceptions import OperationalError
 from .models import ContextEntry
 from .serializers import ContextEntrySerializer
-from apps.ai_integration.services import AIService # Import the AI Service
+from common.pagination import TimestampCursorPagination
+from ai_integration.tasks import analyze_context_entry, analyze_context_entries # Background AI analysis
+
+logger = logging.getLogger(__name__)
 
 class ContextEntryViewSet(viewsets.ModelViewSet):
     """
     A ViewSet for viewing and editing ContextEntry instances.
     Provides CRUD operations for context entries.
-    Automatically processes content with AI upon creation/update.
+    Automatically queues AI processing of the content upon creation/update.
     """
     queryset = ContextEntry.objects.all().order_by('-timestamp')
     serializer_class = ContextEntrySerializer
+    pagination_class = TimestampCursorPagination
     # permission_classes = [permissions.IsAuthenticated] # Add permissions later if needed
 
     def get_queryset(self):
@@ -31,37 +43,124 @@ class ContextEntryViewSet(viewsets.ModelViewSet):
         end_date = self.request.query_params.get('end_date', None)
 
         if start_date:
-            queryset = queryset.filter(timestamp__gte=start_date)
+            start, _ = self._parse_timestamp_param('start_date', start_date)
+            queryset = queryset.filter(timestamp__gte=start)
         if end_date:
-            # Add one day to end_date to include the entire end_date
-            # Or ensure the date format includes time if you want to be precise
-            queryset = queryset.filter(timestamp__lte=end_date)
+            end, is_date = self._parse_timestamp_param('end_date', end_date)
+            if is_date:
+                # Include the entire end_date by filtering up to the start of the next day
+                queryset = queryset.filter(timestamp__lt=end + timedelta(days=1))
+            else:
+                queryset = queryset.filter(timestamp__lte=end)
 
         return queryset
 
+    def _parse_timestamp_param(self, name, value):
+        """
+        Parses a date (YYYY-MM-DD) or ISO 8601 datetime query parameter into an aware datetime,
+        so the timestamp filters compare against a datetime and can use the timestamp index.
+        Returns the datetime and whether the parameter was a plain date (taken as the start of that day).
+        """
+        try:
+            day = parse_date(value)
+            is_date = day is not None
+            if is_date:
+                parsed = datetime.combine(day, time.min)
+            else:
+                parsed = parse_datetime(value)
+                if parsed is None:
+                    raise ValueError(value)
+        except ValueError:
+            raise ValidationError({name: 'Enter a valid date (YYYY-MM-DD) or ISO 8601 datetime.'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed, is_date
+
     def perform_create(self, serializer):
         """
-        Override create method to analyze content with AI before saving.
+        Override create method to queue AI analysis of the content after saving.
         """
-        instance = serializer.save() # Save the instance first to get an ID
-        ai_service = AIService()
-        insights = ai_service.analyze_context(instance.content)
-        if insights:
-            instance.processed_insights = insights
-            instance.save(update_fields=['processed_insights']) # Save only the insights field
-        return instance
+        return self._save_and_analyze(serializer)
 
     def perform_update(self, serializer):
         """
-        Override update method to re-analyze content with AI if content changes.
+        Override update method to queue AI re-analysis if content changes.
         """
-        instance = serializer.save() # Save the instance with updated data
         # Check if content has actually changed
-        if 'content' in serializer.validated_data:
-            ai_service = AIService()
-            insights = ai_service.analyze_context(instance.content)
-            if insights:
-                instance.processed_insights = insights
-                instance.save(update_fields=['processed_insights'])
+        new_content = serializer.validated_data.get('content')
+        if new_content is not None and new_content != serializer.instance.content:
+            return self._save_and_analyze(serializer)
+        return serializer.save() # Save the instance with updated data
+
+    @action(detail=False, methods=['post'], url_path='bulk-create')
+    def bulk_create(self, request):
+        """
+        Creates multiple context entries at once (e.g. a bulk sync of messages or emails).
+        Expects a list of context entries in request data.
+        The entries are inserted with a single query and their AI analysis is queued as a single job
+        that sends the AI requests concurrently.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        entries = [ContextEntry(**data) for data in serializer.validated_data]
+        content_hashes = [ContextEntry.hash_content(entry.content) for entry in entries]
+        # Insights already generated for identical content are reused without calling the AI again
+        existing_insights = {
+            content_hash: (insights, insights_hash)
+            for content_hash, insights, insights_hash in ContextEntry.objects.filter(
+                analyzed_content_hash__in=set(content_hashes), processed_insights_status='done'
+            ).values_list('analyzed_content_hash', 'processed_insights', 'processed_insights_hash')
+        }
+        for entry, content_hash in zip(entries, content_hashes):
+            if content_hash in existing_insights:
+                entry.processed_insights, entry.processed_insights_hash = existing_insights[content_hash]
+                entry.processed_insights_status = 'done'
+                entry.analyzed_content_hash = content_hash
+            else:
+                entry.processed_insights_status = 'pending'
+
+        entries = ContextEntry.objects.bulk_create(entries)
+        pending_entries = [entry for entry in entries if entry.processed_insights_status == 'pending']
+        if pending_entries:
+            entry_ids = [entry.pk for entry in pending_entries]
+            transaction.on_commit(lambda: self._queue_analysis(pending_entries, analyze_context_entries, entry_ids))
+        return Response(self.get_serializer(entries, many=True).data, status=status.HTTP_201_CREATED)
+
+    def _save_and_analyze(self, serializer):
+        """
+        Saves the entry and queues AI analysis of its content.
+        Insights already generated for identical content are reused without calling the AI again.
+        """
+        content_hash = ContextEntry.hash_content(serializer.validated_data['content'])
+        existing = ContextEntry.objects.filter(
+            analyzed_content_hash=content_hash, processed_insights_status='done'
+        ).values_list('processed_insights', 'processed_insights_hash').first()
+        if existing is not None:
+            existing_insights, existing_insights_hash = existing
+            return serializer.save(
+                processed_insights=existing_insights,
+                processed_insights_hash=existing_insights_hash,
+                processed_insights_status='done',
+                analyzed_content_hash=content_hash,
+            )
+
+        instance = serializer.save(processed_insights_status='pending')
+        # Queue only after commit so the worker is guaranteed to see the saved row
+        transaction.on_commit(lambda: self._queue_analysis([instance], analyze_context_entry, instance.pk))
         return instance
 
+    def _queue_analysis(self, entries, job, *args):
+        """
+        Queues the background analysis job of the given saved entries.
+        If the task broker can't be reached, the entries are marked as failed instead of staying pending,
+        since no job will analyze them; the entries themselves are still saved.
+        """
+        try:
+            job.delay(*args)
+        except OperationalError as e:
+            logger.warning("Could not queue AI analysis of context entries: %s", e)
+            ContextEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(processed_insights_status='error')
+            for entry in entries:
+                entry.processed_insights_status = 'error' # Returned in the response
+
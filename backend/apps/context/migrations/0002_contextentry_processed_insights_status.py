@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-14 18:42
+
+from django.db import migrations, models
+
+
+def mark_analyzed_entries_done(apps, schema_editor):
+    # Entries analyzed before the background queue existed already have their insights
+    ContextEntry = apps.get_model('context', 'ContextEntry')
+    ContextEntry.objects.filter(processed_insights__isnull=False).update(processed_insights_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contextentry',
+            name='processed_insights_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('error', 'Error')], default='pending', help_text='The state of the background AI analysis of the content (Pending, Done, Error).', max_length=10),
+        ),
+        migrations.RunPython(mark_analyzed_entries_done, migrations.RunPython.noop),
+    ]
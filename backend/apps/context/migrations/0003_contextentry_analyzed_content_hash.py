@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-14 18:45
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_analyzed_content(apps, schema_editor):
+    # Record the content hash of entries whose insights are already available
+    ContextEntry = apps.get_model('context', 'ContextEntry')
+    entries = ContextEntry.objects.filter(processed_insights_status='done').exclude(
+        processed_insights__has_key='error' # Raw responses the AI failed to format as JSON
+    ).only('id', 'content')
+    for entry in entries.iterator():
+        entry.analyzed_content_hash = hashlib.sha256(entry.content.encode('utf-8')).hexdigest()
+        entry.save(update_fields=['analyzed_content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0002_contextentry_processed_insights_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contextentry',
+            name='analyzed_content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='SHA-256 of the content the processed insights were generated from.', max_length=64),
+        ),
+        migrations.RunPython(hash_analyzed_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-14 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0003_contextentry_analyzed_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contextentry',
+            index=models.Index(fields=['-timestamp'], name='context_con_timesta_e80dfe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contextentry',
+            index=models.Index(fields=['source_type', '-timestamp'], name='context_con_source__e188b1_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-14 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context', '0004_contextentry_context_con_timesta_e80dfe_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contextentry',
+            name='processed_insights_hash',
+            field=models.BinaryField(help_text='BLAKE2b digest of the processed insights, used to skip rewriting identical insights.', max_length=16, null=True),
+        ),
+    ]
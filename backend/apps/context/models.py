@@ -1,5 +1,9 @@
 
-from django.db import models
+import hashlib
+import orjson
+from django.db import connection, models
+from django.db.models import F, Func, JSONField, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 class ContextEntry(models.Model):
@@ -13,6 +17,12 @@ class ContextEntry(models.Model):
         ('other', 'Other'),
     ]
 
+    INSIGHTS_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('error', 'Error'),
+    ]
+
     content = models.TextField(help_text="The raw content of the context entry.")
     source_type = models.CharField(
         max_length=20,
@@ -29,6 +39,24 @@ class ContextEntry(models.Model):
         null=True,
         help_text="JSON field to store AI-processed insights (e.g., keywords, sentiment, entities)."
     )
+    processed_insights_hash = models.BinaryField(
+        max_length=16,
+        null=True,
+        help_text="BLAKE2b digest of the processed insights, used to skip rewriting identical insights."
+    )
+    processed_insights_status = models.CharField(
+        max_length=10,
+        choices=INSIGHTS_STATUS_CHOICES,
+        default='pending',
+        help_text="The state of the background AI analysis of the content (Pending, Done, Error)."
+    )
+    analyzed_content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text="SHA-256 of the content the processed insights were generated from."
+    )
     created_at = models.DateTimeField(auto_now_add=True, help_text="The date and time when the entry was created in the system.")
     updated_at = models.DateTimeField(auto_now=True, help_text="The date and time when the entry was last updated.")
 
@@ -36,12 +64,20 @@ class ContextEntry(models.Model):
         verbose_name = "Context Entry"
         verbose_name_plural = "Context Entries"
         ordering = ['-timestamp'] # Order by most recent context first
+        indexes = [
+            models.Index(fields=['-timestamp']), # Default ordering and date range filters
+            models.Index(fields=['source_type', '-timestamp']), # Filtering by source type, most recent first
+        ]
 
     def __str__(self):
         """
         String representation of the ContextEntry object.
         """
-        return f"{self.source_type.capitalize()} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}: {self.content[:50]}..."
+        # Querysets that defer the full content (e.g. the admin list) annotate its beginning as content_start
+        content = getattr(self, 'content_start', None)
+        if content is None:
+            content = self.content
+        return f"{self.source_type.capitalize()} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}: {content[:50]}..."
 
     def save(self, *args, **kwargs):
         """
@@ -51,14 +87,67 @@ class ContextEntry(models.Model):
             self.timestamp = timezone.now()
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def hash_content(content):
+        """
+        Returns the SHA-256 hex digest used to match entries with identical content.
+        """
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def hash_insights(insights):
+        """
+        Returns the 16-byte BLAKE2b digest used to detect unchanged insights.
+        """
+        return hashlib.blake2b(orjson.dumps(insights, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
     def add_insight(self, key, value):
         """
         Adds or updates a specific insight in the processed_insights JSON field.
+        On PostgreSQL and SQLite only that key is written, without rewriting the rest of the row.
         """
         if not self.processed_insights:
             self.processed_insights = {}
         self.processed_insights[key] = value
-        self.save()
+        self.processed_insights_hash = None # No longer matches the insights as generated by the AI
+        self.updated_at = timezone.now()
+
+        if self._state.adding:
+            self.save() # Not in the database yet, so there is nothing to update partially
+            return
+        insights_expression = self._set_insight_expression(key, value)
+        if insights_expression is None:
+            self.save(update_fields=['processed_insights', 'processed_insights_hash', 'updated_at'])
+        else:
+            ContextEntry.objects.filter(pk=self.pk).update(
+                processed_insights=insights_expression, processed_insights_hash=None, updated_at=self.updated_at
+            )
+
+    def _set_insight_expression(self, key, value):
+        """
+        Returns a database expression setting one key of processed_insights,
+        or None if the database has no JSON function for it.
+        """
+        current_insights = Coalesce(F('processed_insights'), Value({}, output_field=JSONField()))
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.fields import ArrayField # Requires psycopg, so only import on PostgreSQL
+            return Func(
+                current_insights,
+                Value([key], output_field=ArrayField(models.TextField())),
+                Value(value, output_field=JSONField()),
+                Value(True), # Create the key if it doesn't exist yet
+                function='jsonb_set',
+                output_field=JSONField(),
+            )
+        if connection.vendor == 'sqlite' and '"' not in key:
+            return Func(
+                current_insights,
+                Value(f'$."{key}"'),
+                Func(Value(value, output_field=JSONField()), function='json'), # Insert as JSON, not as a string
+                function='json_set',
+                output_field=JSONField(),
+            )
+        return None
 
     def get_insight(self, key):
         """
@@ -8,5 +8,5 @@ class ContextEntrySerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = ContextEntry
-        fields = ['id', 'content', 'source_type', 'timestamp', 'processed_insights', 'created_at', 'updated_at']
-        read_only_fields = ['processed_insights', 'created_at', 'updated_at'] # Insights are AI-generated
+        fields = ['id', 'content', 'source_type', 'timestamp', 'processed_insights', 'processed_insights_status', 'created_at', 'updated_at']
+        read_only_fields = ['processed_insights', 'processed_insights_status', 'created_at', 'updated_at'] # Insights are AI-generated
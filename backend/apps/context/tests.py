@@ -1,3 +1,69 @@
-from django.test import TestCase
+from unittest import mock
+from django.test import TestCase, TransactionTestCase
+from kombu.exceptions import OperationalError
+from rest_framework.test import APIClient
+from .models import ContextEntry
 
-# Create your tests here.
+
+class AddInsightTests(TestCase):
+    """
+    add_insight writes a single key of the stored insights.
+    """
+    def setUp(self):
+        self.entry = ContextEntry.objects.create(content='Meeting at 10', processed_insights={'sentiment': 'neutral'})
+
+    def test_adds_key_keeping_others(self):
+        self.entry.add_insight('keywords', ['meeting'])
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.processed_insights, {'sentiment': 'neutral', 'keywords': ['meeting']})
+
+    def test_replaces_existing_key(self):
+        self.entry.add_insight('sentiment', 'positive')
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.processed_insights, {'sentiment': 'positive'})
+
+    def test_keeps_concurrently_written_keys(self):
+        # Written by another process after this instance was loaded; only the added key is updated
+        ContextEntry.objects.filter(pk=self.entry.pk).update(processed_insights={'sentiment': 'neutral', 'entities': ['Bob']})
+        self.entry.add_insight('keywords', ['meeting'])
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.processed_insights, {'sentiment': 'neutral', 'entities': ['Bob'], 'keywords': ['meeting']})
+
+    def test_adds_to_empty_insights(self):
+        ContextEntry.objects.filter(pk=self.entry.pk).update(processed_insights=None)
+        self.entry.processed_insights = None
+        self.entry.add_insight('priority', {'score': 80, 'urgent': True})
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.processed_insights, {'priority': {'score': 80, 'urgent': True}})
+
+    def test_clears_insights_hash(self):
+        ContextEntry.objects.filter(pk=self.entry.pk).update(processed_insights_hash=ContextEntry.hash_insights({'sentiment': 'neutral'}))
+        self.entry.add_insight('sentiment', 'positive')
+        self.entry.refresh_from_db()
+        self.assertIsNone(self.entry.processed_insights_hash)
+
+
+class BrokerUnavailableTests(TransactionTestCase):
+    """
+    Context entries are still saved when their analysis can't be queued, and are marked as failed.
+    Runs in autocommit like requests do, so the jobs are queued as soon as the entries are saved.
+    """
+    def setUp(self):
+        self.client = APIClient()
+
+    @mock.patch('context.api_view.analyze_context_entry.delay', side_effect=OperationalError('Connection refused'))
+    def test_create_marks_entry_failed(self, delay):
+        with self.assertLogs('context.api_view', 'WARNING'):
+            response = self.client.post('/api/context/', {'content': 'Meeting at 10', 'source_type': 'note'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['processed_insights_status'], 'error')
+        self.assertEqual(ContextEntry.objects.get().processed_insights_status, 'error')
+
+    @mock.patch('context.api_view.analyze_context_entries.delay', side_effect=OperationalError('Connection refused'))
+    def test_bulk_create_marks_entries_failed(self, delay):
+        data = [{'content': 'Meeting at 10', 'source_type': 'note'}, {'content': 'Call Bob', 'source_type': 'note'}]
+        with self.assertLogs('context.api_view', 'WARNING'):
+            response = self.client.post('/api/context/bulk-create/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([entry['processed_insights_status'] for entry in response.data], ['error', 'error'])
+        self.assertFalse(ContextEntry.objects.exclude(processed_insights_status='error').exists())
@@ -30,5 +30,5 @@ class TaskAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-    readonly_fields = ('created_at', 'updated_at') # These fields are managed by the system
+    readonly_fields = ('priority', 'created_at', 'updated_at') # These fields are managed by the system
 
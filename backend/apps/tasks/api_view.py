@@ -1,20 +1,49 @@
-# tasks/views.py
+# tasks/api_view.py
 
+import logging
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import Length, Substr
+from django.db.models.lookups import GreaterThan
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from kombu.exceptions import OperationalError
 from .models import Category, Task
-from .serializers import CategorySerializer, TaskSerializer
-from ai_integration.services import AIService # Import the AI Service
+from .serializers import CategorySerializer, TaskSerializer, TaskListSerializer, PriorityScoreSerializer, TaskIdsSerializer
+from .tasks import apply_ai_to_task, queue_prioritization # Background AI processing
+from common.mixins import ConditionalGETMixin
+from . import cache as category_cache
+from ai_integration.services import ai_service # Shared AI Service instance
 from django.utils import timezone # For current date in deadline suggestion
 
-class CategoryViewSet(viewsets.ModelViewSet):
+logger = logging.getLogger(__name__)
+
+# Number of description characters shown for each task in the list
+DESCRIPTION_PREVIEW_LENGTH = 200
+
+class CategoryViewSet(ConditionalGETMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing and editing Category instances.
     Provides CRUD operations for categories.
     """
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
+    pagination_class = None # Loaded in full for the category dropdowns
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns all categories, cached until one of them changes.
+        Cached responses, including 304 Not Modified ones, don't query the database.
+        """
+        cached = category_cache.get_category_list()
+        if cached is None:
+            queryset = self.get_queryset()
+            summary = queryset.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+            cached = {**summary, 'data': self.get_serializer(queryset, many=True).data}
+            category_cache.set_category_list(cached)
+        return self._conditional_response(request, cached['last_modified'], cached['count'], lambda: Response(cached['data']))
     # permission_classes = [permissions.IsAuthenticated] # Add permissions later if needed
 
     @action(detail=True, methods=['post'], url_path='increment-usage')
@@ -37,13 +66,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return Response({'status': 'usage decremented'}, status=status.HTTP_200_OK)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGETMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing and editing Task instances.
     Provides CRUD operations for tasks and custom actions for AI integration.
     """
-    queryset = Task.objects.all().order_by('-created_at') # Default ordering
+    queryset = Task.objects.select_related('category').order_by('-created_at') # Default ordering; category_name is serialized
     serializer_class = TaskSerializer
+    last_modified_fields = ('updated_at', 'category__updated_at') # Tasks include their category name
     # permission_classes = [permissions.IsAuthenticated] # Add permissions later if needed
 
     def get_queryset(self):
@@ -65,96 +95,74 @@ class TaskViewSet(viewsets.ModelViewSet):
         if priority_param:
             queryset = queryset.filter(priority=priority_param)
 
+        if self.action == 'list':
+            # Skip loading full descriptions, which can be long; the task detail includes them
+            queryset = queryset.only(
+                'id', 'title', 'category', 'category__name', 'priority_score', 'priority', 'deadline', 'status',
+                'is_ai_suggested', 'created_at', 'updated_at'
+            ).annotate(
+                description_preview=Substr('description', 1, DESCRIPTION_PREVIEW_LENGTH),
+                description_truncated=GreaterThan(Length('description'), DESCRIPTION_PREVIEW_LENGTH),
+            )
+
         return queryset
 
+    def get_serializer_class(self):
+        """
+        Uses a lighter serializer for the task list.
+        """
+        if self.action == 'list':
+            return TaskListSerializer
+        return super().get_serializer_class()
+
     def perform_create(self, serializer):
         """
         Override create method to optionally apply AI suggestions upon task creation.
         AI suggestions are applied only if 'apply_ai' is True in the request data.
+        They are applied in the background, so the task is returned without them.
         """
         # Check if AI should be applied
         apply_ai = self.request.data.get('apply_ai', False)
-        
-        task = serializer.save() # Save the task initially
+
+        task = serializer.save() # is_ai_suggested defaults to False
 
         if apply_ai:
-            ai_service = AIService()
-
-            # 1. AI Priority Suggestion
-            priority_score = ai_service.get_task_priority_score(task.title, task.description)
-            if priority_score is not None:
-                task.set_ai_priority(priority_score) # This method also sets human-readable priority
-
-            # 2. AI Deadline Suggestion
-            suggested_deadline = ai_service.suggest_deadline(task.title, task.description, timezone.now().date())
-            if suggested_deadline:
-                task.deadline = suggested_deadline
-
-            # 3. AI Category Suggestion
-            suggested_categories = ai_service.suggest_categories_and_tags(task.title, task.description)
-            if suggested_categories:
-                # Try to assign the first suggested category if it exists or create it
-                if suggested_categories:
-                    first_suggested_category_name = suggested_categories[0]
-                    category, created = Category.objects.get_or_create(name=first_suggested_category_name)
-                    task.category = category
-                    if created:
-                        print(f"Created new category: {category.name}")
-                    # Increment usage for the newly assigned category
-                    category.increment_usage() # This is handled in Task.save() now, but good to be explicit
-
-            # 4. AI Task Enhancement (optional, might be better as a separate action)
-            # enhanced_description = ai_service.enhance_task_description(task.title, task.description)
-            # if enhanced_description:
-            #     task.description = enhanced_description
-
-            task.is_ai_suggested = True # Mark as AI-processed
-            task.save() # Save all AI-generated updates
-        else:
-            # If no AI is applied, just ensure is_ai_suggested is False
-            task.is_ai_suggested = False
-            task.save()
+            # Queue only after commit so the worker is guaranteed to see the saved task
+            transaction.on_commit(lambda: self._queue_ai_suggestions(task.pk))
 
     def perform_update(self, serializer):
         """
         Override update method to potentially re-apply AI suggestions if title/description changes.
         AI suggestions are re-applied only if 'apply_ai' is True in the request data.
+        They are applied in the background, so the task is returned without them.
         """
         # Check if AI should be applied
         apply_ai = self.request.data.get('apply_ai', False)
-        
+
         task = serializer.save() # Save the task with updated data
 
-        if apply_ai:
-            ai_service = AIService()
-            re_process_ai = False
-
-            # Check if title or description has changed, which might trigger re-processing
-            if 'title' in serializer.validated_data or 'description' in serializer.validated_data:
-                re_process_ai = True
-
-            if re_process_ai:
-                # Re-suggest priority
-                priority_score = ai_service.get_task_priority_score(task.title, task.description)
-                if priority_score is not None:
-                    task.set_ai_priority(priority_score)
-
-                # Re-suggest deadline
-                suggested_deadline = ai_service.suggest_deadline(task.title, task.description, timezone.now().date())
-                if suggested_deadline:
-                    task.deadline = suggested_deadline
-
-                # Re-suggest category (optional, might be disruptive if user set it manually)
-                # suggested_categories = ai_service.suggest_categories_and_tags(task.title, task.description)
-                # if suggested_categories:
-                #     first_suggested_category_name = suggested_categories[0]
-                #     category, created = Category.objects.get_or_create(name=first_suggested_category_name)
-                #     task.category = category
-                #     if created:
-                #         print(f"Created new category on update: {category.name}")
-
-                task.is_ai_suggested = True # Mark as AI-processed
-                task.save() # Save all AI-generated updates
+        # Check if title or description has changed, which might trigger re-processing
+        if apply_ai and ('title' in serializer.validated_data or 'description' in serializer.validated_data):
+            # Re-suggesting the category is left out, as it might be disruptive if the user set it manually
+            transaction.on_commit(lambda: self._queue_ai_suggestions(task.pk, suggest_category=False))
+
+    def _queue_ai_suggestions(self, task_id, **kwargs):
+        """
+        Queues the background job applying AI suggestions to a saved task.
+        If the task broker can't be reached, the task is kept without AI suggestions rather than failing the request.
+        """
+        try:
+            apply_ai_to_task.delay(task_id, **kwargs)
+        except OperationalError as e:
+            logger.warning("Could not queue AI suggestions for task %s: %s", task_id, e)
+
+    def get_success_headers(self, data):
+        """
+        Points to the created task, which clients can poll for AI suggestions applied in the background.
+        """
+        if 'id' not in data:
+            return {}
+        return {'Location': reverse('task-detail', args=[data['id']], request=self.request)}
 
     @action(detail=True, methods=['post'], url_path='complete')
     def complete(self, request, pk=None):
@@ -173,15 +181,11 @@ class TaskViewSet(viewsets.ModelViewSet):
         Expects 'score' in request data.
         """
         task = self.get_object()
-        score = request.data.get('score')
-        if score is not None:
-            try:
-                score = float(score)
-                task.set_ai_priority(score)
-                return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
-            except ValueError:
-                return Response({'error': 'Score must be a number'}, status=status.HTTP_400_BAD_REQUEST)
-        return Response({'error': 'Score is required'}, status=status.HTTP_400_BAD_REQUEST)
+        score_serializer = PriorityScoreSerializer(data=request.data)
+        score_serializer.is_valid(raise_exception=True) # A number from 0 to 100
+        task.set_ai_priority(score_serializer.validated_data['score'])
+        task.save(update_fields=['priority_score', 'updated_at'])
+        return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='assign-category-by-name')
     def assign_category_by_name(self, request, pk=None):
@@ -194,6 +198,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         category_name = request.data.get('category_name')
         if category_name:
             task.assign_category(category_name)
+            task.save(update_fields=['category', 'updated_at'])
             return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
         return Response({'error': 'Category name is required'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -203,40 +208,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         Endpoint to trigger AI suggestions (priority, deadline, category, enhancement) for a specific task.
         """
         task = self.get_object()
-        ai_service = AIService()
-        response_data = {}
-
-        # Get context insights if available (assuming we can fetch related context entries)
-        context_insights = None # Placeholder for now
-
-        # Priority
-        priority_score = ai_service.get_task_priority_score(task.title, task.description, context_insights)
-        if priority_score is not None:
-            response_data['suggested_priority_score'] = priority_score
-            # Need to get human-readable priority from score
-            # This logic should ideally be in a helper or Task model method
-            if priority_score >= 70:
-                response_data['suggested_priority'] = 'high'
-            elif priority_score >= 40:
-                response_data['suggested_priority'] = 'medium'
-            else:
-                response_data['suggested_priority'] = 'low'
-
-        # Deadline
-        suggested_deadline = ai_service.suggest_deadline(task.title, task.description, timezone.now().date(), context_insights)
-        if suggested_deadline:
-            response_data['suggested_deadline'] = suggested_deadline.isoformat()
-
-        # Categories
-        suggested_categories = ai_service.suggest_categories_and_tags(task.title, task.description)
-        if suggested_categories:
-            response_data['suggested_categories'] = suggested_categories
-
-        # Task Enhancement
-        enhanced_description = ai_service.enhance_task_description(task.title, task.description, context_insights)
-        if enhanced_description:
-            response_data['enhanced_description'] = enhanced_description
-
+        response_data = self._ai_suggestions(task.title, task.description)
         response_data['message'] = 'AI suggestions generated.'
         return Response(response_data, status=status.HTTP_200_OK)
 
@@ -253,63 +225,55 @@ class TaskViewSet(viewsets.ModelViewSet):
         if not title:
             return Response({'error': 'Title is required for AI suggestions.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        ai_service = AIService()
+        response_data = self._ai_suggestions(title, description)
+        response_data['message'] = 'AI suggestions generated for new task.'
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    def _ai_suggestions(self, title, description):
+        """
+        Generates the AI suggestions (priority, deadline, categories, enhanced description) for a task.
+        They are requested together rather than one after the other, so this takes about one AI round-trip.
+        """
+        suggestions = ai_service.enrich_task(title, description, timezone.localdate())
         response_data = {}
 
         # Priority
-        priority_score = ai_service.get_task_priority_score(title, description)
+        priority_score = suggestions['priority_score']
         if priority_score is not None:
             response_data['suggested_priority_score'] = priority_score
-            # Need to get human-readable priority from score
-            # This logic should ideally be in a helper or Task model method
-            if priority_score >= 70:
-                response_data['suggested_priority'] = 'high'
-            elif priority_score >= 40:
-                response_data['suggested_priority'] = 'medium'
-            else:
-                response_data['suggested_priority'] = 'low'
+            response_data['suggested_priority'] = Task.priority_from_score(priority_score)
 
         # Deadline
-        suggested_deadline = ai_service.suggest_deadline(title, description, timezone.now().date())
-        if suggested_deadline:
-            response_data['suggested_deadline'] = suggested_deadline.isoformat()
+        if suggestions['deadline']:
+            response_data['suggested_deadline'] = suggestions['deadline'].isoformat()
 
         # Categories
-        suggested_categories = ai_service.suggest_categories_and_tags(title, description)
-        if suggested_categories:
-            response_data['suggested_categories'] = suggested_categories
+        if suggestions['categories']:
+            response_data['suggested_categories'] = suggestions['categories']
 
         # Task Enhancement
-        enhanced_description = ai_service.enhance_task_description(title, description)
-        if enhanced_description:
-            response_data['enhanced_description'] = enhanced_description
+        if suggestions['enhanced_description']:
+            response_data['enhanced_description'] = suggestions['enhanced_description']
+
+        return response_data
 
-        response_data['message'] = 'AI suggestions generated for new task.'
-        return Response(response_data, status=status.HTTP_200_OK)
-    
     @action(detail=False, methods=['post'], url_path='batch-ai-prioritization')
     def batch_ai_prioritization(self, request):
         """
         Endpoint to trigger AI prioritization for multiple tasks.
         Expects a list of task IDs in request data.
+        The tasks are prioritized in the background; IDs of tasks that don't exist are ignored.
         """
-        task_ids = request.data.get('task_ids', [])
-        if not isinstance(task_ids, list):
-            return Response({'error': 'task_ids must be a list'}, status=status.HTTP_400_BAD_REQUEST)
-
-        ai_service = AIService()
-        processed_tasks = []
-        for task_id in task_ids:
-            try:
-                task = Task.objects.get(id=task_id)
-                priority_score = ai_service.get_task_priority_score(task.title, task.description)
-                if priority_score is not None:
-                    task.set_ai_priority(priority_score)
-                    task.is_ai_suggested = True
-                    task.save()
-                    processed_tasks.append(self.get_serializer(task).data)
-            except Task.DoesNotExist:
-                continue # Skip if task not found
-
-        return Response({'message': f'Processed {len(processed_tasks)} tasks for AI prioritization.', 'tasks': processed_tasks}, status=status.HTTP_200_OK)
+        ids_serializer = TaskIdsSerializer(data={'task_ids': request.data.get('task_ids', [])})
+        ids_serializer.is_valid(raise_exception=True) # A list of integer IDs
+        task_ids = ids_serializer.validated_data['task_ids']
+
+        # One query keeps only the existing tasks, so no jobs are queued for missing ones
+        task_ids = list(Task.objects.filter(id__in=task_ids).order_by('id').values_list('id', flat=True))
+        try:
+            queue_prioritization(task_ids)
+        except OperationalError as e:
+            logger.warning("Could not queue AI prioritization of %d tasks: %s", len(task_ids), e)
+            return Response({'error': 'AI prioritization is currently unavailable.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({'message': f'Queued {len(task_ids)} tasks for AI prioritization.', 'task_ids': task_ids}, status=status.HTTP_202_ACCEPTED)
 
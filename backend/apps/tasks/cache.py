@@ -0,0 +1,49 @@
+import uuid
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Changes whenever a category is created, updated or deleted, so cached lists under older versions are never read again
+_VERSION_KEY = 'category_list:version'
+
+
+def _is_shared():
+    """
+    Returns whether the cache is shared between processes.
+    Celery workers change categories too, so a process-local cache would serve a stale list until it expires.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+def _list_key():
+    """
+    Returns the cache key of the category list for the current version.
+    A new version is started if it was evicted from the cache.
+    """
+    version = cache.get_or_set(_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+    return f'category_list:{version}'
+
+def get_category_list():
+    """
+    Returns the cached category list, or None on a cache miss or if the cache isn't shared.
+    """
+    if not _is_shared():
+        return None
+    return cache.get(_list_key())
+
+def set_category_list(category_list):
+    """
+    Stores the category list for the current version, if the cache is shared.
+    """
+    if not _is_shared():
+        return
+    timeout = getattr(settings, 'CATEGORY_LIST_CACHE_TIMEOUT', 60 * 5)
+    cache.set(_list_key(), category_list, timeout)
+
+def invalidate_category_list():
+    """
+    Starts a new version, so the next request rebuilds the category list.
+    """
+    if not _is_shared():
+        return
+    cache.set(_VERSION_KEY, uuid.uuid4().hex, None)
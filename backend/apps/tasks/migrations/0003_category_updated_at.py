@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-14 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_tasks_task_status_4a0a95_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='The date and time when the category was last updated.'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-14 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_category_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='priority_score',
+            field=models.FloatField(default=0.0, help_text='AI-generated priority score for the task (e.g., 0.0 to 100.0).'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-14 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_alter_task_priority_score'),
+    ]
+
+    # A regular field can't be altered into a generated one, so priority is removed and added back
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_priorit_a900d4_idx',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='priority',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(priority_score__gte=80, then=models.Value('urgent')), models.When(priority_score__gte=60, then=models.Value('high')), models.When(priority_score__gte=30, then=models.Value('medium')), default=models.Value('low')), help_text='Human-readable priority level (Low, Medium, High, Urgent), derived from the priority score.', output_field=models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=10)),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['priority'], name='tasks_task_priorit_a900d4_idx'),
+        ),
+    ]
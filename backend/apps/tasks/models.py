@@ -1,10 +1,19 @@
-from django.db import models
+import logging
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
+from .cache import invalidate_category_list
 from datetime import timedelta
 
+logger = logging.getLogger(__name__)
+
 def default_deadline():
     return timezone.now() + timedelta(days=7)
 
+# Lowest priority score of each priority level above 'low', from the most urgent down
+PRIORITY_THRESHOLDS = [(80, 'urgent'), (60, 'high'), (30, 'medium')]
+
 class Category(models.Model):
     """
     Represents a category or tag for tasks.
@@ -12,6 +21,7 @@ class Category(models.Model):
     name = models.CharField(max_length=100, unique=True, help_text="The name of the category.")
     usage_frequency = models.IntegerField(default=0, help_text="How often this category is used.")
     created_at = models.DateTimeField(auto_now_add=True, help_text="The date and time when the category was created.")
+    updated_at = models.DateTimeField(auto_now=True, help_text="The date and time when the category was last updated.")
 
     class Meta:
         verbose_name = "Category"
@@ -24,20 +34,46 @@ class Category(models.Model):
         """
         return self.name
 
+    @classmethod
+    def get_or_create_many(cls, names):
+        """
+        Returns a dict mapping each of the given names to its category, creating the missing ones.
+        Takes two queries however many names there are, and doesn't fail if another process creates one meanwhile.
+        """
+        names = set(names)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Only looked up for the debug message, as ignore_conflicts doesn't report which rows were inserted
+            existing_names = set(cls.objects.filter(name__in=names).values_list('name', flat=True))
+            for name in names - existing_names:
+                logger.debug("Created new category: %s", name)
+        cls.objects.bulk_create([cls(name=name) for name in names], ignore_conflicts=True)
+        transaction.on_commit(invalidate_category_list) # bulk_create doesn't send post_save
+        return {category.name: category for category in cls.objects.filter(name__in=names)}
+
     def increment_usage(self):
         """
         Increments the usage frequency of the category.
+        Uses a single atomic UPDATE, so concurrent changes aren't lost.
         """
-        self.usage_frequency += 1
-        self.save()
+        Category.objects.filter(pk=self.pk).update(usage_frequency=F('usage_frequency') + 1, updated_at=timezone.now())
+        self._reset_usage_frequency()
 
     def decrement_usage(self):
         """
         Decrements the usage frequency of the category, ensuring it doesn't go below zero.
+        Uses a single atomic UPDATE, so concurrent changes aren't lost.
         """
-        if self.usage_frequency > 0:
-            self.usage_frequency -= 1
-            self.save()
+        Category.objects.filter(pk=self.pk).update(
+            usage_frequency=Greatest(F('usage_frequency') - 1, 0), updated_at=timezone.now()
+        )
+        self._reset_usage_frequency()
+
+    def _reset_usage_frequency(self):
+        """
+        Drops the stale in-memory usage frequency; it is reloaded from the database if accessed again.
+        """
+        self.__dict__.pop('usage_frequency', None)
+        transaction.on_commit(invalidate_category_list) # Usage frequency is part of the cached category list
 
 
 
@@ -69,17 +105,19 @@ class Task(models.Model):
         null=True,
         help_text="The category or tag associated with the task."
     )
-    priority_score = models.DecimalField(
-        max_digits=5,
-        decimal_places=2,
-        default=0.00,
-        help_text="AI-generated priority score for the task (e.g., 0.00 to 100.00)."
+    priority_score = models.FloatField(
+        default=0.0,
+        help_text="AI-generated priority score for the task (e.g., 0.0 to 100.0)."
     )
-    priority = models.CharField(
-        max_length=10,
-        choices=PRIORITY_CHOICES,
-        default='medium',
-        help_text="Human-readable priority level (Low, Medium, High, Urgent)."
+    priority = models.GeneratedField(
+        # Computed by the database from priority_score, so the two can't disagree
+        expression=Case(
+            *[When(priority_score__gte=threshold, then=Value(level)) for threshold, level in PRIORITY_THRESHOLDS],
+            default=Value('low'),
+        ),
+        output_field=models.CharField(max_length=10, choices=PRIORITY_CHOICES),
+        db_persist=True,
+        help_text="Human-readable priority level (Low, Medium, High, Urgent), derived from the priority score."
     )
     deadline = models.DateTimeField(
         blank=True,
@@ -104,6 +142,13 @@ class Task(models.Model):
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
         ordering = ['-priority_score', 'deadline', 'created_at'] # Order by priority (desc), then deadline, then creation date
+        indexes = [
+            models.Index(fields=['status']), # Filtering by status
+            models.Index(fields=['priority']), # Filtering by priority
+            models.Index(fields=['deadline']),
+            models.Index(fields=['-created_at']), # Ordering of the task list endpoint
+            models.Index(fields=['-priority_score', 'deadline', 'created_at'], name='task_order_idx'), # Default ordering
+        ]
 
     def __str__(self):
         """
@@ -111,21 +156,45 @@ class Task(models.Model):
         """
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the stored category so save() can detect a change without re-reading the task.
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'category_id' in instance.__dict__: # Not deferred
+            instance._original_category_id = instance.category_id
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """
+        Forgets the remembered category when the category is reloaded, as it is now the stored one.
+        """
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'category' in fields or 'category_id' in fields:
+            self._original_category_id = self.category_id
+
     def save(self, *args, **kwargs):
         """
         Override save method to update category usage frequency.
         """
-        # Handle category usage frequency when a task's category changes
-        if self.pk: # If task already exists
-            old_task = Task.objects.get(pk=self.pk)
-            if old_task.category and old_task.category != self.category:
-                old_task.category.decrement_usage()
-            if self.category and old_task.category != self.category:
-                self.category.increment_usage()
-        elif self.category: # If new task and has a category
-            self.category.increment_usage()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'category' in update_fields or 'category_id' in update_fields:
+            # Handle category usage frequency when a task's category changes
+            if self._state.adding:
+                old_category_id = None
+            elif hasattr(self, '_original_category_id'):
+                old_category_id = self._original_category_id
+            else: # Category wasn't loaded with the task
+                old_category_id = Task.objects.filter(pk=self.pk).values_list('category_id', flat=True).first()
+            if old_category_id != self.category_id:
+                if old_category_id is not None:
+                    Category(pk=old_category_id).decrement_usage() # Only the pk is needed for the UPDATE
+                if self.category:
+                    self.category.increment_usage()
 
         super().save(*args, **kwargs)
+        self._original_category_id = self.category_id
 
     def delete(self, *args, **kwargs):
         """
@@ -141,30 +210,34 @@ class Task(models.Model):
         """
         if new_status in [choice[0] for choice in self.STATUS_CHOICES]:
             self.status = new_status
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
 
     def assign_category(self, category_name):
         """
         Assigns a category to the task. Creates the category if it doesn't exist.
+        The task itself isn't saved.
         """
         category, created = Category.objects.get_or_create(name=category_name)
         self.category = category
-        self.save()
         return category
 
     def set_ai_priority(self, score):
         """
-        Sets the AI-generated priority score and updates the human-readable priority.
+        Sets the AI-generated priority score.
+        The task itself isn't saved; the database derives the stored priority level from the score.
         """
         self.priority_score = score
-        if score >= 80:
-            self.priority = 'urgent'
-        elif score >= 60:
-            self.priority = 'high'
-        elif score >= 30:
-            self.priority = 'medium'
-        else:
-            self.priority = 'low'
-        self.save()
\ No newline at end of file
+        self.priority = self.priority_from_score(score) # Django doesn't reload generated fields after an UPDATE
+
+    @staticmethod
+    def priority_from_score(score):
+        """
+        Returns the human-readable priority level for an AI-generated priority score,
+        as computed by the database for the priority field.
+        """
+        for threshold, level in PRIORITY_THRESHOLDS:
+            if score >= threshold:
+                return level
+        return 'low'
\ No newline at end of file
@@ -1,4 +1,5 @@
 
+import math
 from rest_framework import serializers
 from .models import Category, Task
 
@@ -9,8 +10,8 @@ class CategorySerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Category
-        fields = ['id', 'name', 'usage_frequency', 'created_at']
-        read_only_fields = ['usage_frequency', 'created_at'] # These fields are managed by the system
+        fields = ['id', 'name', 'usage_frequency', 'created_at', 'updated_at']
+        read_only_fields = ['usage_frequency', 'created_at', 'updated_at'] # These fields are managed by the system
 
 class TaskSerializer(serializers.ModelSerializer):
     """
@@ -34,14 +35,10 @@ class TaskSerializer(serializers.ModelSerializer):
         """
         Custom create method to handle category assignment.
         """
-        category_data = validated_data.pop('category', None)
-        task = Task.objects.create(**validated_data)
-        if category_data:
-            # Assuming category_data is a Category instance from the validated data
-            # If you want to create/get category by name, you'd need to adjust this.
-            task.category = category_data
-            task.save()
-        return task
+        # The category (a Category instance from the validated data) is saved with the task in a single INSERT,
+        # and Task.save() increments its usage.
+        # If you want to create/get category by name, you'd need to adjust this.
+        return Task.objects.create(**validated_data)
 
     def update(self, instance, validated_data):
         """
@@ -49,11 +46,8 @@ class TaskSerializer(serializers.ModelSerializer):
         """
         # Handle category update if provided
         new_category = validated_data.get('category', None)
-        if new_category and instance.category != new_category:
-            if instance.category:
-                instance.category.decrement_usage() # Decrement old category usage
-            new_category.increment_usage() # Increment new category usage
-            instance.category = new_category
+        if new_category:
+            instance.category = new_category # Category usage is updated in Task.save()
 
         # Update other fields
         instance.title = validated_data.get('title', instance.title)
@@ -68,3 +62,41 @@ class TaskSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+
+class TaskListSerializer(TaskSerializer):
+    """
+    Serializer for the task list, which loads only the beginning of each description.
+    The full description is only included in the task detail.
+    """
+    description_preview = serializers.CharField(read_only=True, allow_null=True)
+    description_truncated = serializers.BooleanField(read_only=True) # Whether the preview is shorter than the description
+
+    class Meta(TaskSerializer.Meta):
+        fields = [
+            'id', 'title', 'description_preview', 'description_truncated', 'category', 'category_name',
+            'priority_score', 'priority', 'deadline', 'status',
+            'is_ai_suggested', 'created_at', 'updated_at'
+        ]
+
+
+class TaskIdsSerializer(serializers.Serializer):
+    """
+    Validates the list of task IDs sent for batch AI prioritization.
+    """
+    # Bounded to the range of the BigAutoField primary key, so the lookup can't overflow the database integer
+    task_ids = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1), allow_empty=True)
+
+
+class PriorityScoreSerializer(serializers.Serializer):
+    """
+    Validates the priority score set for a task through the API.
+    """
+    score = serializers.FloatField(min_value=0, max_value=100)
+
+    def validate_score(self, value):
+        """
+        Rejects NaN, which passes the range checks but can't be stored.
+        """
+        if math.isnan(value):
+            raise serializers.ValidationError('A valid number is required.')
+        return value
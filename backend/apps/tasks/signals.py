@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .cache import invalidate_category_list
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_categories(sender, **kwargs):
+    """
+    Drops the cached category list whenever a category is saved or deleted.
+    Waits for the commit, so the list isn't rebuilt from data about to change.
+    """
+    transaction.on_commit(invalidate_category_list)
+
+
+@receiver(pre_delete, sender=Category)
+def touch_category_tasks(sender, instance, **kwargs):
+    """
+    Marks the tasks of a category being deleted as modified.
+    Their category is cleared by SET_NULL without updating updated_at, so cached task lists would otherwise look current.
+    """
+    instance.tasks.update(updated_at=timezone.now())
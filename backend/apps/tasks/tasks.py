@@ -0,0 +1,85 @@
+from celery import group, shared_task
+from django.db import transaction
+from django.utils import timezone
+from ai_integration.services import ai_service
+from .models import Category, Task
+
+# Number of tasks prioritized by each job of a batch
+_PRIORITIZATION_CHUNK_SIZE = 20
+
+
+@shared_task
+def apply_ai_to_task(task_id, suggest_category=True):
+    """
+    Applies AI suggestions (priority, deadline and optionally category) to a task.
+    Runs in a Celery worker so the API can respond without waiting for the AI model.
+    """
+    task = Task.objects.filter(pk=task_id).only('title', 'description').first()
+    if task is None:
+        return # Task was deleted before the job ran
+
+    # All suggestions come from one fused AI request (enrich_task falls back to concurrent prompts)
+    suggestions = ai_service.enrich_task(task.title, task.description, timezone.localdate())
+
+    with transaction.atomic():
+        # Re-read and lock the task: it may have been edited (e.g. its category changed) during the AI request,
+        # and the category usage update in Task.save() must start from the stored category
+        task = Task.objects.select_for_update().filter(pk=task_id).first()
+        if task is None:
+            return # Task was deleted during the AI request
+        update_fields = ['is_ai_suggested', 'updated_at']
+
+        # 1. AI Priority Suggestion
+        priority_score = suggestions['priority_score']
+        if priority_score is not None:
+            task.set_ai_priority(priority_score) # The database derives the human-readable priority from the score
+            update_fields.append('priority_score')
+
+        # 2. AI Deadline Suggestion
+        if suggestions['deadline']:
+            task.deadline = suggestions['deadline']
+            update_fields.append('deadline')
+
+        # 3. AI Category Suggestion (skipped on updates, as it might be disruptive if the user set it manually)
+        if suggest_category and suggestions['categories']:
+            # Assign the first suggested category, creating it if it doesn't exist
+            # (its usage is updated when the task is saved)
+            category_name = suggestions['categories'][0]
+            task.category = Category.get_or_create_many([category_name])[category_name]
+            update_fields.append('category')
+
+        # 4. AI Task Enhancement (optional, might be better as a separate action)
+        # if suggestions['enhanced_description']:
+        #     task.description = suggestions['enhanced_description']
+
+        task.is_ai_suggested = True # Mark as AI-processed
+        task.save(update_fields=update_fields) # Only the AI-generated fields, keeping other edits made meanwhile
+
+
+@shared_task
+def prioritize_tasks(task_ids):
+    """
+    Sets AI-generated priorities for several tasks.
+    Tasks that aren't found (e.g. deleted since being queued) are skipped.
+    """
+    tasks = list(Task.objects.in_bulk(task_ids).values())
+    # All tasks are scored with a single AI request
+    priority_scores = ai_service.score_batch([(task.title, task.description) for task in tasks])
+    prioritized_tasks = []
+    for task, priority_score in zip(tasks, priority_scores):
+        if priority_score is not None:
+            task.set_ai_priority(priority_score)
+            task.is_ai_suggested = True
+            task.updated_at = timezone.now()
+            prioritized_tasks.append(task)
+    # A single UPDATE query; saving each task would also track its category usage
+    Task.objects.bulk_update(prioritized_tasks, ['priority_score', 'is_ai_suggested', 'updated_at'])
+
+
+def queue_prioritization(task_ids):
+    """
+    Queues AI prioritization of the given tasks, split into chunks processed by separate jobs.
+    """
+    chunks = [task_ids[i:i + _PRIORITIZATION_CHUNK_SIZE] for i in range(0, len(task_ids), _PRIORITIZATION_CHUNK_SIZE)]
+    if chunks:
+        group(prioritize_tasks.s(chunk) for chunk in chunks).delay()
@@ -1,3 +1,279 @@
-from django.test import TestCase
+from datetime import datetime
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+from rest_framework.test import APIClient
+from .models import Category, Task
+from .tasks import apply_ai_to_task
 
-# Create your tests here.
+
+class TaskListQueryTests(TestCase):
+    """
+    The task list loads each task's category in the same query as the tasks.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        categories = [Category.objects.create(name=f'Category {i}') for i in range(3)]
+        for i in range(10):
+            Task.objects.create(title=f'Task {i}', category=categories[i % 3])
+
+    def test_list_query_count_doesnt_grow_with_tasks(self):
+        # One aggregate for the conditional GET validators and one query for the page
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertTrue(all(task['category_name'] for task in response.data['results']))
+
+    def test_list_marks_truncated_description_previews(self):
+        Task.objects.update(description='Short')
+        long_task = Task.objects.create(title='Long', description='x' * 250)
+        results = {task['id']: task for task in self.client.get('/api/tasks/').data['results']}
+        self.assertNotIn('description', results[long_task.pk])
+        self.assertEqual(results[long_task.pk]['description_preview'], 'x' * 200)
+        self.assertTrue(results[long_task.pk]['description_truncated'])
+        short_task = next(task for task in results.values() if task['id'] != long_task.pk)
+        self.assertEqual(short_task['description_preview'], 'Short')
+        self.assertFalse(short_task['description_truncated'])
+
+
+class CategoryUsageTests(TestCase):
+    """
+    Category usage frequencies follow the tasks assigned to each category.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.work = Category.objects.create(name='Work')
+        self.home = Category.objects.create(name='Home')
+        self.task = Task.objects.create(title='Write report', category=self.work)
+
+    def assertUsage(self, category, usage_frequency):
+        category.refresh_from_db()
+        self.assertEqual(category.usage_frequency, usage_frequency)
+
+    def test_create_increments_usage(self):
+        self.assertUsage(self.work, 1)
+
+    def test_patch_moves_usage_to_new_category(self):
+        response = self.client.patch(f'/api/tasks/{self.task.pk}/', {'category': self.home.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertUsage(self.work, 0)
+        self.assertUsage(self.home, 1)
+
+    def test_patch_without_category_change_keeps_usage(self):
+        response = self.client.patch(f'/api/tasks/{self.task.pk}/', {'title': 'Write the report'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertUsage(self.work, 1)
+        self.assertUsage(self.home, 0)
+
+    def test_delete_decrements_usage(self):
+        response = self.client.delete(f'/api/tasks/{self.task.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertUsage(self.work, 0)
+
+    def test_save_uses_category_loaded_with_task(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.category = self.home
+        # Decrement, increment and the task UPDATE, without re-reading the stored category
+        with self.assertNumQueries(3):
+            task.save(update_fields=['category'])
+        self.assertUsage(self.work, 0)
+        self.assertUsage(self.home, 1)
+
+    def test_save_with_deferred_category_reads_stored_one(self):
+        task = Task.objects.defer('category').get(pk=self.task.pk)
+        task.category = self.home
+        task.save(update_fields=['category'])
+        self.assertUsage(self.work, 0)
+        self.assertUsage(self.home, 1)
+
+    def test_save_after_refresh_uses_refreshed_category(self):
+        task = Task.objects.get(pk=self.task.pk)
+        other = Task.objects.get(pk=self.task.pk)
+        other.category = self.home
+        other.save()
+        task.refresh_from_db()
+        errands = Category.objects.create(name='Errands')
+        task.category = errands
+        task.save()
+        self.assertUsage(self.work, 0)
+        self.assertUsage(self.home, 0)
+        self.assertUsage(errands, 1)
+
+    def test_usage_never_goes_below_zero(self):
+        self.work.decrement_usage()
+        self.work.decrement_usage()
+        self.assertUsage(self.work, 0)
+
+
+class ConditionalGETTests(TestCase):
+    """
+    Task responses are only answered with 304 Not Modified while everything they render is unchanged.
+    """
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Work')
+        self.task = Task.objects.create(title='Write report', category=self.category)
+
+    def test_unchanged_task_is_not_modified(self):
+        etag = self.client.get(f'/api/tasks/{self.task.pk}/')['ETag']
+        response = self.client.get(f'/api/tasks/{self.task.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_renaming_category_changes_task_etag(self):
+        etag = self.client.get(f'/api/tasks/{self.task.pk}/')['ETag']
+        self.client.patch(f'/api/categories/{self.category.pk}/', {'name': 'Office'}, format='json')
+        response = self.client.get(f'/api/tasks/{self.task.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['category_name'], 'Office')
+
+    def test_deleting_category_marks_its_tasks_modified(self):
+        updated_at = self.task.updated_at
+        self.client.delete(f'/api/categories/{self.category.pk}/')
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.category_id)
+        self.assertGreater(self.task.updated_at, updated_at)
+
+    def test_category_list_is_rebuilt_after_change(self):
+        etag = self.client.get('/api/categories/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/categories/', {'name': 'Home'}, format='json')
+        response = self.client.get('/api/categories/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([category['name'] for category in response.data], ['Home', 'Work'])
+
+    def test_category_list_isnt_cached_in_process_local_cache(self):
+        self.client.get('/api/categories/')
+        # As done by a Celery worker, whose invalidation wouldn't reach this process' cache
+        Category.objects.filter(pk=self.category.pk).update(usage_frequency=5)
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.data[0]['usage_frequency'], 5)
+
+    @mock.patch('tasks.cache._is_shared', return_value=True)
+    def test_category_list_is_served_from_shared_cache(self, is_shared):
+        etag = self.client.get('/api/categories/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/categories/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/categories/{self.category.pk}/', {'name': 'Office'}, format='json')
+        response = self.client.get('/api/categories/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['name'], 'Office')
+
+
+@mock.patch('tasks.api_view.queue_prioritization')
+class BatchPrioritizationTests(TestCase):
+    """
+    Batch prioritization queues only existing tasks and rejects malformed IDs.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.task = Task.objects.create(title='Write report')
+
+    def post(self, data):
+        return self.client.post('/api/tasks/batch-ai-prioritization/', data, format='json')
+
+    def test_queues_existing_tasks(self, queue_prioritization):
+        response = self.post({'task_ids': [self.task.pk, self.task.pk + 100]})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['task_ids'], [self.task.pk])
+        queue_prioritization.assert_called_once_with([self.task.pk])
+
+    def test_rejects_non_integer_ids(self, queue_prioritization):
+        response = self.post({'task_ids': ['abc']})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('task_ids', response.data)
+        queue_prioritization.assert_not_called()
+
+    def test_rejects_non_list(self, queue_prioritization):
+        response = self.post({'task_ids': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        queue_prioritization.assert_not_called()
+
+    def test_broker_unavailable(self, queue_prioritization):
+        queue_prioritization.side_effect = OperationalError('Connection refused')
+        with self.assertLogs('tasks.api_view', 'WARNING'):
+            response = self.post({'task_ids': [self.task.pk]})
+        self.assertEqual(response.status_code, 503)
+
+    def test_rejects_out_of_range_ids(self, queue_prioritization):
+        response = self.post({'task_ids': [2 ** 63]})
+        self.assertEqual(response.status_code, 400)
+        queue_prioritization.assert_not_called()
+
+
+@mock.patch('tasks.api_view.apply_ai_to_task.delay', side_effect=OperationalError('Connection refused'))
+class BrokerUnavailableTests(TransactionTestCase):
+    """
+    Tasks are still saved when their AI suggestions can't be queued.
+    Runs in autocommit like requests do, so the jobs are queued as soon as the tasks are saved.
+    """
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_create_with_ai(self, delay):
+        with self.assertLogs('tasks.api_view', 'WARNING'):
+            response = self.client.post('/api/tasks/', {'title': 'Write report', 'apply_ai': True}, format='json')
+        self.assertEqual(response.status_code, 201)
+        delay.assert_called_once_with(response.data['id'])
+        self.assertTrue(Task.objects.filter(pk=response.data['id']).exists())
+
+    def test_update_with_ai(self, delay):
+        task = Task.objects.create(title='Write report')
+        with self.assertLogs('tasks.api_view', 'WARNING'):
+            response = self.client.patch(f'/api/tasks/{task.pk}/', {'title': 'Write the report', 'apply_ai': True}, format='json')
+        self.assertEqual(response.status_code, 200)
+        delay.assert_called_once_with(task.pk, suggest_category=False)
+
+
+@mock.patch('tasks.tasks.ai_service')
+class ApplyAIToTaskTests(TestCase):
+    """
+    The AI suggestions for a task come from a single enrich_task call.
+    """
+    def setUp(self):
+        self.task = Task.objects.create(title='Prepare slides', description='For Monday')
+        self.deadline = timezone.make_aware(datetime(2026, 10, 20))
+        self.suggestions = {'priority_score': 85.0, 'deadline': self.deadline, 'categories': ['Work'], 'enhanced_description': None}
+
+    def test_applies_all_suggestions(self, ai_service):
+        ai_service.enrich_task.return_value = self.suggestions
+        apply_ai_to_task(self.task.pk)
+        ai_service.enrich_task.assert_called_once()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.priority_score, 85.0)
+        self.assertEqual(self.task.priority, 'urgent')
+        self.assertEqual(self.task.deadline, self.deadline)
+        self.assertEqual(self.task.category.name, 'Work')
+        self.assertTrue(self.task.is_ai_suggested)
+
+    def test_category_changed_during_ai_request(self, ai_service):
+        home, errands = Category.objects.create(name='Home'), Category.objects.create(name='Errands')
+        self.task.category = home
+        self.task.save()
+
+        def move_task_to_errands(*args):
+            # A user edit saved while the AI request runs
+            task = Task.objects.get(pk=self.task.pk)
+            task.category = errands
+            task.save()
+            return self.suggestions
+        ai_service.enrich_task.side_effect = move_task_to_errands
+
+        apply_ai_to_task(self.task.pk)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.category.name, 'Work')
+        for category, usage_frequency in ((home, 0), (errands, 0), (self.task.category, 1)):
+            category.refresh_from_db()
+            self.assertEqual(category.usage_frequency, usage_frequency)
+
+    def test_skips_category_when_not_suggested(self, ai_service):
+        ai_service.enrich_task.return_value = self.suggestions
+        apply_ai_to_task(self.task.pk, suggest_category=False)
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.category)
+        self.assertFalse(Category.objects.filter(name='Work').exists())
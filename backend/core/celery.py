@@ -0,0 +1,14 @@
+import os
+
+from celery import Celery
+
+# Set the default Django settings module for the 'celery' program.
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+app = Celery('core')
+
+# Read Celery configuration from Django settings, using the CELERY_ prefix
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Load tasks.py modules from all registered Django apps
+app.autodiscover_tasks()
@@ -92,6 +92,20 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared between the web and Celery worker processes through Redis when CACHE_URL is set (e.g. redis://localhost:6379/1),
+# so category changes made by workers invalidate the cached category list everywhere.
+# Without it each process has its own local memory cache, and the category list isn't cached at all.
+
+if os.environ.get('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_URL'],
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -134,9 +148,87 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Logging
+# App loggers write through a queue to a background thread, so logging never blocks request threads
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'rate_limit': {
+            '()': 'common.log_handlers.RateLimitFilter',
+            'interval': 60, # Seconds between repeats of a rate-limited message
+        },
+    },
+    'formatters': {
+        'simple': {
+            'format': '{levelname} {asctime} {name}: {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'background_console': {
+            'class': 'common.log_handlers.BackgroundStreamHandler',
+            'filters': ['rate_limit'],
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'ai_integration': {
+            'handlers': ['background_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'context': {
+            'handlers': ['background_console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'tasks': {
+            'handlers': ['background_console'],
+            'level': 'WARNING', # Set to DEBUG to log categories created from AI suggestions
+            'propagate': False,
+        },
+    },
+}
+
+
+# Django REST framework
+# JSON is rendered and parsed with orjson; the browsable API and form parsers are kept as in DRF's defaults
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'common.renderers.OrjsonParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
+
 # AI Integration Settings
 AI_MODEL_API_URL = 'http://localhost:1234/v1/chat/completions' # LM Studio default API endpoint
 AI_MODEL_NAME = 'tinyllama-1.1b-chat-v1.0' # LM Studio default model name
+# Each AI call fails over to its fallback value (e.g. priority 0, deadline in 7 days) instead of hanging:
+# at most 3 connection attempts of AI_CONNECT_TIMEOUT each, then AI_READ_TIMEOUT between bytes of the response.
+AI_CONNECT_TIMEOUT = 3.05 # Seconds
+AI_READ_TIMEOUT = 30 # Seconds
+AI_MAX_PARALLEL_REQUESTS = 4 # Concurrent AI requests for bulk work; match LM Studio's parallel slots (max 10, the HTTP pool size)
+AI_CACHE_ALIAS = 'default' # Django cache used for AI model responses
+AI_CACHE_TIMEOUT = 60 * 60 * 24 # Reuse an AI response for an identical prompt for 24 hours
+# The category list is cached (only in a shared cache, see CACHES) until a category changes; the timeout is a safety net
+CATEGORY_LIST_CACHE_TIMEOUT = 60 * 5
+
+
+# Celery settings (background AI processing)
+# Start a worker with: celery -A core worker -l info
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_TASK_IGNORE_RESULT = True # Task results are written to the database, not a result backend
 
 
 # CORS settings
@@ -11,7 +11,7 @@ interface Task {
   description: string;
   category?: number;
   category_name?: string;
-  priority_score?: string;
+  priority_score?: number;
   priority?: string;
   deadline?: string;
   status: string;
@@ -48,7 +48,7 @@ const TaskForm: React.FC<TaskFormProps> = ({ initialTask, onTaskSubmitted }) =>
   const [success, setSuccess] = useState<string | null>(null);
 
   // AI Suggestions states
-  const [aiPriorityScore, setAiPriorityScore] = useState<string | undefined>(initialTask?.priority_score);
+  const [aiPriorityScore, setAiPriorityScore] = useState<number | undefined>(initialTask?.priority_score);
   const [aiPriority, setAiPriority] = useState<string | undefined>(initialTask?.priority);
   const [aiDeadline, setAiDeadline] = useState<string | undefined>(initialTask?.deadline);
   const [aiCategories, setAiCategories] = useState<string[]>([]);
@@ -241,7 +241,7 @@ const TaskForm: React.FC<TaskFormProps> = ({ initialTask, onTaskSubmitted }) =>
           ) : (
             <>
               <p className="text-sm text-blue-700">
-                <strong>Priority:</strong> {aiPriority || 'N/A'} ({aiPriorityScore || 'N/A'})
+                <strong>Priority:</strong> {aiPriority || 'N/A'} ({aiPriorityScore ?? 'N/A'})
               </p>
               <p className="text-sm text-blue-700">
                 <strong>Deadline:</strong> {aiDeadline ? new Date(aiDeadline).toLocaleDateString() : 'N/A'}
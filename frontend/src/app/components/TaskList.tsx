@@ -7,10 +7,11 @@ import React, { useEffect, useState } from 'react';
 interface Task {
   id: number;
   title: string;
-  description: string;
+  description_preview: string; // The list only includes the beginning of each description
+  description_truncated: boolean;
   category: number;
   category_name: string;
-  priority_score: string;
+  priority_score: number;
   priority: string;
   deadline: string;
   status: string;
@@ -28,7 +29,9 @@ interface TaskListProps {
 
 const TaskList: React.FC<TaskListProps> = ({ filterCategory, filterStatus, filterPriority }) => {
   const [tasks, setTasks] = useState<Task[]>([]);
+  const [nextPageUrl, setNextPageUrl] = useState<string | null>(null); // Cursor link to the next (older) page of tasks
   const [loading, setLoading] = useState<boolean>(true);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
 
   // Add a state to trigger re-fetch after completing a task
@@ -56,8 +59,9 @@ const TaskList: React.FC<TaskListProps> = ({ filterCategory, filterStatus, filte
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
-        const data: Task[] = await response.json();
-        setTasks(data);
+        const data: { next: string | null; results: Task[] } = await response.json(); // Paginated: the latest page of tasks
+        setTasks(data.results);
+        setNextPageUrl(data.next);
       } catch (err: any) {
         setError(err.message);
       } finally {
@@ -68,6 +72,24 @@ const TaskList: React.FC<TaskListProps> = ({ filterCategory, filterStatus, filte
     fetchTasks();
   }, [filterCategory, filterStatus, filterPriority, refreshTrigger]); // Add refreshTrigger to dependencies
 
+  const handleLoadMore = async () => {
+    if (!nextPageUrl) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(nextPageUrl); // The cursor link keeps the current filters
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      const data: { next: string | null; results: Task[] } = await response.json();
+      setTasks(prev => [...prev, ...data.results]);
+      setNextPageUrl(data.next);
+    } catch (err: any) {
+      setError(`Failed to load more tasks: ${err.message}`);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCompleteTask = async (taskId: number) => {
     try {
       const response = await fetch(`http://localhost:8000/api/tasks/${taskId}/complete/`, {
@@ -107,7 +129,7 @@ const TaskList: React.FC<TaskListProps> = ({ filterCategory, filterStatus, filte
           {tasks.map((task) => (
             <div key={task.id} className="bg-white shadow-lg rounded-lg p-6 border border-gray-200 flex flex-col">
               <h3 className="text-xl font-semibold text-gray-900 mb-2">{task.title}</h3>
-              <p className="text-gray-700 text-sm mb-3 flex-grow">{task.description}</p>
+              <p className="text-gray-700 text-sm mb-3 flex-grow">{task.description_preview}{task.description_truncated && '…'}</p>
               <div className="text-xs text-gray-500 mb-1">
                 Category: <span className="font-medium text-gray-700">{task.category_name || 'N/A'}</span>
               </div>
@@ -141,6 +163,17 @@ const TaskList: React.FC<TaskListProps> = ({ filterCategory, filterStatus, filte
           ))}
         </div>
       )}
+      {nextPageUrl && (
+        <div className="mt-6 text-center">
+          <button
+            onClick={handleLoadMore}
+            className="bg-blue-500 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded focus:outline-none focus:shadow-outline disabled:opacity-50 disabled:cursor-not-allowed"
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Loading...' : 'Load more tasks'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
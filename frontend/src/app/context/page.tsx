@@ -15,7 +15,9 @@ export default function ContextPage() {
   const [content, setContent] = useState('');
   const [sourceType, setSourceType] = useState('note'); // Default source type
   const [contextEntries, setContextEntries] = useState<ContextEntry[]>([]);
+  const [nextPageUrl, setNextPageUrl] = useState<string | null>(null); // Cursor link to the next (older) page of entries
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [submitLoading, setSubmitLoading] = useState(false);
   const [submitError, setSubmitError] = useState<string | null>(null);
@@ -52,8 +54,9 @@ export default function ContextPage() {
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
-      const data: ContextEntry[] = await response.json();
-      setContextEntries(data);
+      const data: { next: string | null; results: ContextEntry[] } = await response.json(); // Paginated: the latest page of entries
+      setContextEntries(data.results);
+      setNextPageUrl(data.next);
     } catch (err: any) {
       setError(err.message);
     } finally {
@@ -65,6 +68,24 @@ export default function ContextPage() {
     fetchContextEntries();
   }, [fetchContextEntries]);
 
+  const handleLoadMore = async () => {
+    if (!nextPageUrl) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(nextPageUrl);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      const data: { next: string | null; results: ContextEntry[] } = await response.json();
+      setContextEntries(prev => [...prev, ...data.results]);
+      setNextPageUrl(data.next);
+    } catch (err: any) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setSubmitLoading(true);
@@ -176,6 +197,17 @@ export default function ContextPage() {
                 </div>
               </div>
             ))}
+            {nextPageUrl && (
+              <div className="text-center pt-2">
+                <button
+                  onClick={handleLoadMore}
+                  className="bg-blue-500 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded focus:outline-none focus:shadow-outline disabled:opacity-50 disabled:cursor-not-allowed"
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? 'Loading...' : 'Load older entries'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
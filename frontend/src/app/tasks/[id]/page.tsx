@@ -10,7 +10,7 @@ interface Task {
   description: string;
   category?: number;
   category_name?: string;
-  priority_score?: string;
+  priority_score?: number;
   priority?: string;
   deadline?: string;
   status: string;